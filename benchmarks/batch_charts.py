@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Batch matplotlib chart benchmark.
+
+Renders one PNG per user three ways: a fresh pyplot figure per chart (the
+previous plot_scores_matplotlib), the reused ChartRenderer in one process,
+and plot_charts spreading the charts over a process pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    ScoreSeries,
+    plot_charts,
+    plot_marker,
+    plot_scores_matplotlib,
+)
+
+
+def sample_series(weeks: int, seed: int) -> ScoreSeries:
+    rng = random.Random(seed)
+    days = [date(2020, 1, 6) + timedelta(weeks=index) for index in range(weeks)]
+    return ScoreSeries(
+        totals={day: round(rng.uniform(0, 100), 2) for day in days},
+        categories={
+            category: {day: round(rng.uniform(0, 100), 2) for day in days}
+            for category in CATEGORIES
+        },
+    )
+
+
+def plot_fresh_figure(series: ScoreSeries, output_path: Path) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    for label, scores in [("총합", series.totals), *sorted(series.categories.items())]:
+        weeks = sorted(scores)
+        plt.plot(weeks, [scores[week] for week in weeks], marker=plot_marker(weeks), label=label)
+    plt.ylabel("점수")
+    plt.legend()
+    plt.title("루틴 점수 추이")
+    plt.xlabel("주 시작일")
+    plt.ylim(0, 100)
+    plt.grid(True, axis="y", linestyle="--", alpha=0.6)
+    plt.tight_layout()
+    plt.savefig(output_path)
+    plt.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    options = parser.parse_args()
+    warnings.filterwarnings("ignore", "Glyph .* missing from font")
+
+    charts = [sample_series(options.weeks, user) for user in range(options.users)]
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+        # Warm-up pays the matplotlib import and font cache for both paths.
+        plot_fresh_figure(charts[0], out / "warm.png")
+        plot_scores_matplotlib(charts[0], out / "warm.png")
+        runs = {
+            "fresh figure": lambda: [
+                plot_fresh_figure(series, out / f"fresh-{i}.png")
+                for i, series in enumerate(charts)
+            ],
+            "reused figure": lambda: [
+                plot_scores_matplotlib(series, out / f"reused-{i}.png")
+                for i, series in enumerate(charts)
+            ],
+            f"pool x{options.jobs}": lambda: plot_charts(
+                [(series, out / f"pool-{i}.png") for i, series in enumerate(charts)],
+                options.jobs,
+            ),
+        }
+        print(f"{options.users} charts, {options.weeks} weeks, {os.cpu_count()} CPU(s)")
+        for name, run in runs.items():
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            print(f"{name:14s} {elapsed / options.users * 1000:7.1f} ms/chart")
+
+
+if __name__ == "__main__":
+    main()
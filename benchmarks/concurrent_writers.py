@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Concurrent writer stress test.
+
+Starts N writers against one fresh CSV file and reports append throughput for
+three setups: separate processes each fsyncing every row, threads each
+fsyncing every row, and threads sharing a GroupCommitter.  After every run the
+file must hold exactly one header, every row written, and a totals sidecar
+that matches a full rescan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    Durability,
+    GroupCommitter,
+    RoutineEntry,
+    append_entries,
+    load_week_scores,
+    make_entry,
+    rebuild_week_scores,
+)
+
+ALWAYS = Durability("always")
+
+
+def writer_entries(writer: int, rows: int) -> list[RoutineEntry]:
+    # Distinct (week, category) keys per writer so the expected totals are
+    # independent of interleaving.
+    start = date(2000, 1, 3) + timedelta(weeks=writer * rows)
+    return [
+        make_entry(
+            (start + timedelta(weeks=index)).isoformat(),
+            CATEGORIES[index % len(CATEGORIES)],
+            str(index % 8),
+        )
+        for index in range(rows)
+    ]
+
+
+def append_each(path: Path, entries: list[RoutineEntry], barrier) -> None:
+    barrier.wait()
+    for entry in entries:
+        append_entries(path, [entry], ALWAYS)
+
+
+def run_processes(path: Path, writers: int, rows: int) -> float:
+    barrier = multiprocessing.Barrier(writers + 1)
+    workers = [
+        multiprocessing.Process(
+            target=append_each, args=(path, writer_entries(writer, rows), barrier)
+        )
+        for writer in range(writers)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+        if worker.exitcode != 0:
+            raise SystemExit(f"writer exited with {worker.exitcode}")
+    return time.perf_counter() - started
+
+
+def run_threads(path: Path, writers: int, rows: int, group: bool) -> float:
+    barrier = threading.Barrier(writers + 1)
+    committer = GroupCommitter(path)
+
+    def work(entries: list[RoutineEntry]) -> None:
+        barrier.wait()
+        for entry in entries:
+            if group:
+                committer.append([entry])
+            else:
+                append_entries(path, [entry], ALWAYS)
+
+    threads = [
+        threading.Thread(target=work, args=(writer_entries(writer, rows),))
+        for writer in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def verify(path: Path, writers: int, rows: int) -> None:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    headers = sum(line.startswith("week_start,") for line in lines)
+    if headers != 1 or not lines[0].startswith("week_start,"):
+        raise SystemExit(f"{path}: expected one leading header, found {headers}")
+    if len(lines) - 1 != writers * rows:
+        raise SystemExit(f"{path}: expected {writers * rows} rows, found {len(lines) - 1}")
+    cached = load_week_scores(path)
+    if cached is None or cached != rebuild_week_scores(path):
+        raise SystemExit(f"{path}: totals sidecar does not match the data file")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200, help="rows per writer")
+    options = parser.parse_args()
+
+    runs = {
+        "processes": lambda path: run_processes(path, options.writers, options.rows),
+        "threads": lambda path: run_threads(path, options.writers, options.rows, False),
+        "group": lambda path: run_threads(path, options.writers, options.rows, True),
+    }
+    total = options.writers * options.rows
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in runs.items():
+            path = Path(tmp) / f"{name}.csv"
+            elapsed = run(path)
+            verify(path, options.writers, options.rows)
+            print(f"{name:10s} {total / elapsed:9.0f} rows/s  ({elapsed:.2f} s, OK)")
+
+
+if __name__ == "__main__":
+    main()
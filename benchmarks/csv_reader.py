@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""CSV reader benchmark.
+
+Streams a generated CSV through the csv.DictReader path and the mmap byte
+splitting path, checks both yield the same rows, and reports rows/s, the
+memory blocks each materialised row keeps alive, and the peak traced memory of
+a streaming pass over the full file and over a tenth of it.  The mmap peak is
+set by the 1 MiB chunk and its line list, so it should not grow with the file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    CSV_HEADER,
+    entry_row,
+    iter_csv_dict_rows,
+    iter_csv_rows,
+    make_entry,
+)
+
+Reader = Callable[[Path], Iterator[tuple[date, str, int, float]]]
+
+
+def write_sample(path: Path, rows: int) -> None:
+    start = date(2000, 1, 3)
+    with path.open("wb") as handle:
+        handle.write(CSV_HEADER)
+        for index in range(rows):
+            entry = make_entry(
+                (start + timedelta(weeks=index % 520)).isoformat(),
+                CATEGORIES[index % len(CATEGORIES)],
+                str(index % 8),
+            )
+            handle.write((",".join(map(str, entry_row(entry))) + "\r\n").encode())
+
+
+def rate(reader: Reader, path: Path) -> tuple[int, float]:
+    started = time.perf_counter()
+    count = sum(1 for _ in reader(path))
+    return count, time.perf_counter() - started
+
+
+def blocks_per_row(reader: Reader, path: Path) -> float:
+    # Live allocator blocks added by holding every row: the row tuple plus any
+    # field objects that are not shared with earlier rows.
+    gc.collect()
+    before = sys.getallocatedblocks()
+    rows = list(reader(path))
+    gc.collect()
+    return (sys.getallocatedblocks() - before) / len(rows)
+
+
+def peak(reader: Reader, path: Path) -> int:
+    # Tracing slows everything down, so the peak comes from its own pass.
+    tracemalloc.start()
+    for _ in reader(path):
+        pass
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return traced_peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    readers: dict[str, Reader] = {"DictReader": iter_csv_dict_rows, "mmap": iter_csv_rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "routines.csv"
+        small = Path(tmp) / "small.csv"
+        write_sample(path, options.rows)
+        write_sample(small, options.rows // 10)
+        if list(iter_csv_dict_rows(path)) != list(iter_csv_rows(path)):
+            raise SystemExit("readers disagree")
+        print(f"{path.stat().st_size / 1e6:.1f} MB, {options.rows:,} rows")
+        print(f"{'':11s} {'rows/s':>12s} {'blocks/row':>11s} {'peak':>9s} {'peak 1/10':>10s}")
+        for name, reader in readers.items():
+            count, elapsed = rate(reader, path)
+            print(
+                f"{name:11s} {count / elapsed:12,.0f} {blocks_per_row(reader, path):11.2f} "
+                f"{peak(reader, path) / 1e6:7.1f}MB {peak(reader, small) / 1e6:8.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
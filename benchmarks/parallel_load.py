@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Parallel CSV aggregation benchmark.
+
+Builds one large CSV and times load_score_series (the path behind summary
+cache rebuilds, plot and report) with increasing --jobs, checking that every
+run produces the same series as the serial one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    CSV_HEADER,
+    PARALLEL_MIN_BYTES,
+    entry_row,
+    load_score_series,
+    make_entry,
+)
+
+
+def write_sample(path: Path, rows: int) -> None:
+    start = date(2000, 1, 3)
+    block = "".join(
+        ",".join(
+            map(
+                str,
+                entry_row(
+                    make_entry(
+                        (start + timedelta(weeks=index % 520)).isoformat(),
+                        CATEGORIES[index % len(CATEGORIES)],
+                        str(index % 8),
+                    )
+                ),
+            )
+        )
+        + "\r\n"
+        for index in range(10_000)
+    ).encode()
+    with path.open("wb") as handle:
+        handle.write(CSV_HEADER)
+        for _ in range(rows // 10_000):
+            handle.write(block)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "routines.csv"
+        write_sample(path, options.rows)
+        size = path.stat().st_size
+        print(f"{size / 1e6:.1f} MB, {os.cpu_count()} CPU(s)")
+        if size < PARALLEL_MIN_BYTES:
+            print(f"below {PARALLEL_MIN_BYTES >> 20} MiB: every run stays serial")
+        # The untimed serial pass warms the page cache and gives the reference.
+        expected = load_score_series(path, 1)
+        for jobs in options.jobs:
+            started = time.perf_counter()
+            series = load_score_series(path, jobs)
+            elapsed = time.perf_counter() - started
+            if series != expected:
+                raise SystemExit(f"--jobs {jobs} produced a different series")
+            print(f"--jobs {jobs:<3d} {elapsed * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""CLI cold-start benchmark.
+
+Runs add/list/summary in fresh interpreters, reports the median wall time and
+fails if any of them imported a plotting module.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "routine_tracker.py"
+PLOTTING_MODULES = ("matplotlib", "PIL", "numpy")
+
+COMMANDS: dict[str, list[str]] = {
+    "add": ["add", "2024-01-01", "운동", "3"],
+    "list": ["list"],
+    "summary": ["summary"],
+}
+
+
+def imported_modules(stderr: str) -> set[str]:
+    modules = set()
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return modules
+
+
+def run(data: Path, args: list[str]) -> tuple[float, set[str]]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(SCRIPT), "--data", str(data), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - started, imported_modules(result.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "routines.csv"
+        run(data, ["init"])
+        failed = False
+        for name, args in COMMANDS.items():
+            timings = []
+            touched: set[str] = set()
+            for _ in range(options.repeat):
+                elapsed, modules = run(data, args)
+                timings.append(elapsed)
+                touched |= {
+                    module
+                    for module in modules
+                    if module.split(".")[0] in PLOTTING_MODULES
+                }
+            status = "OK" if not touched else f"FAIL ({', '.join(sorted(touched))})"
+            failed = failed or bool(touched)
+            print(f"{name:8s} {statistics.median(timings) * 1000:7.1f} ms  {status}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
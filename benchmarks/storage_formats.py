@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Storage format load benchmark.
+
+Writes the same rows to CSV, .rtb and SQLite, then times loading every entry
+(``list``) and aggregating weekly scores (``summary``/``plot``).  Aggregation
+is timed both on the pure-Python path and, where available, the NumPy path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import routine_tracker  # noqa: E402
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    Durability,
+    RoutineEntry,
+    append_entries,
+    load_entries,
+    load_score_series,
+    make_entry,
+)
+
+SUFFIXES = (".csv", ".rtb", ".db")
+
+
+def sample_entries(rows: int) -> list[RoutineEntry]:
+    start = date(1900, 1, 1)
+    return [
+        make_entry(
+            (start + timedelta(weeks=index // len(CATEGORIES))).isoformat(),
+            CATEGORIES[index % len(CATEGORIES)],
+            str(index % 8),
+        )
+        for index in range(rows)
+    ]
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    options = parser.parse_args()
+
+    entries = sample_entries(options.rows)
+    numpy_available = routine_tracker.numpy_available()
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'':5s} {'size':>10s} {'load':>9s} {'aggregate':>10s} {'numpy':>9s}")
+        for suffix in SUFFIXES:
+            path = Path(tmp) / f"routines{suffix}"
+            append_entries(path, entries, Durability("none"))
+            load = timed(load_entries, path)
+            routine_tracker.numpy_available = lambda: False
+            python_path = timed(load_score_series, path)
+            routine_tracker.numpy_available = lambda: numpy_available
+            numpy_path = timed(load_score_series, path) if numpy_available else None
+            columns = [
+                f"{path.stat().st_size:>10,d}",
+                f"{load * 1000:7.0f}ms",
+                f"{python_path * 1000:8.0f}ms",
+                f"{numpy_path * 1000:7.0f}ms" if numpy_path is not None else f"{'-':>9s}",
+            ]
+            print(f"{suffix[1:]:5s} " + " ".join(columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""SVG chart writer benchmark.
+
+Renders the same long series as many separate charts, the way a nightly
+per-user batch does, to plain ``.svg`` and gzip ``.svgz`` files.  Reports the
+time per chart, bytes per chart, and the peak traced memory of one chart.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from routine_tracker import CATEGORIES, ScoreSeries, plot_scores_svg  # noqa: E402
+
+
+def sample_series(weeks: int, seed: int = 0) -> ScoreSeries:
+    rng = random.Random(seed)
+    days = [date(2000, 1, 3) + timedelta(weeks=index) for index in range(weeks)]
+    return ScoreSeries(
+        totals={day: round(rng.uniform(0, 100), 2) for day in days},
+        categories={
+            category: {day: round(rng.uniform(0, 100), 2) for day in days}
+            for category in CATEGORIES
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--weeks", type=int, default=520)
+    parser.add_argument("--charts", type=int, default=500)
+    options = parser.parse_args()
+
+    series = sample_series(options.weeks)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'':5s} {'ms/chart':>9s} {'bytes/chart':>12s} {'peak':>9s}")
+        for suffix in (".svg", ".svgz"):
+            paths = [Path(tmp) / f"user-{index}{suffix}" for index in range(options.charts)]
+            started = time.perf_counter()
+            for path in paths:
+                plot_scores_svg(series, path)
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            plot_scores_svg(series, paths[0])
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            size = sum(path.stat().st_size for path in paths) / len(paths)
+            print(
+                f"{suffix[1:]:5s} {elapsed / len(paths) * 1000:9.2f} {size:12,.0f} "
+                f"{peak / 1e3:7.0f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Week-offset index benchmark.
+
+Builds a mostly chronological CSV with a sprinkle of late back-filled rows,
+then times date-range reads of the most recent weeks with and without the
+``.idx`` sidecar, checking both return the same rows.  It also appends to the
+file and checks the incrementally extended index equals a full rebuild.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import routine_tracker  # noqa: E402
+from routine_tracker import (  # noqa: E402
+    CATEGORIES,
+    CSV_HEADER,
+    Durability,
+    EntryFilter,
+    RoutineEntry,
+    append_entries,
+    data_stamp,
+    index_blocks,
+    index_path,
+    iter_csv_rows,
+    load_week_index,
+    make_entry,
+)
+
+START = date(2000, 1, 3)
+
+
+def sample_entries(weeks: int, per_week: int, seed: int = 0) -> list[RoutineEntry]:
+    rng = random.Random(seed)
+    entries = []
+    for week in range(weeks):
+        for index in range(per_week):
+            # One row in a hundred is a late edit of an older week.
+            target = rng.randrange(weeks) if rng.random() < 0.01 else week
+            entries.append(
+                make_entry(
+                    (START + timedelta(weeks=target)).isoformat(),
+                    CATEGORIES[index % len(CATEGORIES)],
+                    str(index % 8),
+                )
+            )
+    return entries
+
+
+def timed_rows(path: Path, entry_filter: EntryFilter) -> tuple[float, list]:
+    started = time.perf_counter()
+    rows = list(iter_csv_rows(path, entry_filter))
+    return time.perf_counter() - started, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--weeks", type=int, default=1040)
+    parser.add_argument("--per-week", type=int, default=200)
+    parser.add_argument("--recent", type=int, nargs="+", default=[1, 12, 52])
+    options = parser.parse_args()
+
+    entries = sample_entries(options.weeks, options.per_week)
+    # Index files of any size, so smaller --weeks/--per-week runs still
+    # measure and check the index.
+    routine_tracker.INDEX_MIN_BYTES = 0
+    appended = min(1000, len(entries) // 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "routines.csv"
+        append_entries(path, entries[:-appended], Durability("none"))
+        # The first date-range read builds the index; the append then extends it.
+        list(iter_csv_rows(path, EntryFilter(start=START)))
+        append_entries(path, entries[-appended:], Durability("none"))
+        with path.open("rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            rebuilt = index_blocks(mapped, len(CSV_HEADER), len(mapped))
+        if load_week_index(path, data_stamp(path)) != rebuilt:
+            raise SystemExit("extended index differs from a full rebuild")
+        print(f"{path.stat().st_size / 1e6:.1f} MB, {len(rebuilt)} index blocks")
+        print(f"{'weeks':>6s} {'rows':>8s} {'scan':>9s} {'index':>9s}")
+        last = START + timedelta(weeks=options.weeks - 1)
+        for recent in options.recent:
+            entry_filter = EntryFilter(start=last - timedelta(weeks=recent - 1))
+            indexed, rows = timed_rows(path, entry_filter)
+            routine_tracker.INDEX_MIN_BYTES = 1 << 62
+            scanned, expected = timed_rows(path, entry_filter)
+            routine_tracker.INDEX_MIN_BYTES = 0
+            if rows != expected:
+                raise SystemExit(f"--from {entry_filter.start}: index changed the result")
+            print(
+                f"{recent:6d} {len(rows):8,d} {scanned * 1000:7.1f}ms {indexed * 1000:7.1f}ms"
+            )
+        if not index_path(path).exists():
+            raise SystemExit("index file was not written")
+
+
+if __name__ == "__main__":
+    main()
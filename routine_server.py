@@ -0,0 +1,415 @@
+"""Long-running server modes for the routine tracker.
+
+Kept out of routine_tracker.py so that ordinary CLI calls never import
+socket/asyncio. ``serve`` answers one-line JSON requests on a Unix socket and
+``serve-http`` exposes the same data as a small HTTP JSON API; both share one
+in-memory TrackerState and keep the data file as the source of truth.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import socket
+import socketserver
+import threading
+from datetime import date
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+from urllib.parse import urlsplit
+
+from routine_tracker import (
+    DATE_FMT,
+    AppendResult,
+    Durability,
+    EntryFilter,
+    GroupCommitter,
+    RoutineEntry,
+    aggregate_scores,
+    data_stamp,
+    durability_from_args,
+    format_added,
+    format_entries,
+    format_totals,
+    grade_for_score,
+    grades_for_scores,
+    iter_entries,
+    make_entry,
+    parse_week_start,
+    summarize_by_week,
+    update_sketch,
+    week_label,
+    write_report,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class OtherDataError(Exception):
+    """The request names a data file or durability this server does not use."""
+
+
+class TrackerState:
+    """In-memory copy of one data file, reloaded whenever the file changes."""
+
+    def __init__(self, path: Path, durability: Durability, sketch_path: Path) -> None:
+        self.path = path
+        self.sketch_path = sketch_path
+        self.lock = threading.Lock()
+        self.stamp: list[int] | None = None
+        self.entries: dict[tuple[date, str], RoutineEntry] = {}
+        self.totals: dict[date, float] = {}
+        self.views: dict[str, Any] = {}
+        self.committer = GroupCommitter(path, self.apply, durability)
+        self.refresh()
+
+    def current_stamp(self) -> list[int] | None:
+        return data_stamp(self.path) if self.path.exists() else None
+
+    def refresh(self) -> None:
+        stamp = self.current_stamp()
+        if stamp is not None and stamp == self.stamp:
+            return
+        self.entries = {
+            (entry.week_start, entry.category): entry for entry in iter_entries(self.path)
+        }
+        self.totals = summarize_by_week(self.entries.values())
+        self.views.clear()
+        self.stamp = stamp
+
+    def add(self, entry: RoutineEntry) -> float:
+        # Concurrent adds share one locked append + fsync via the committer;
+        # self.lock is only taken to fold the committed batch into memory.
+        self.committer.append([entry])
+        with self.lock:
+            self.refresh()
+            return self.totals[entry.week_start]
+
+    def apply(self, batch: list[RoutineEntry], result: AppendResult) -> None:
+        with self.lock:
+            weeks = {entry.week_start for entry in batch}
+            before = {week: self.totals[week] for week in weeks if week in self.totals}
+            for entry in batch:
+                previous = self.entries.get((entry.week_start, entry.category))
+                self.entries[(entry.week_start, entry.category)] = entry
+                self.totals[entry.week_start] = (
+                    self.totals.get(entry.week_start, 0.0)
+                    + entry.score
+                    - (previous.score if previous is not None else 0.0)
+                )
+            self.views.clear()
+            # Rows another process wrote since the last load are not in memory
+            # yet; forget the stamp so the next request reloads the file.
+            self.stamp = result.after if result.before == self.stamp else None
+            after = {week: self.totals[week] for week in weeks}
+        update_sketch(self.sketch_path, before, after)
+
+    def view(self, command: str) -> list[str]:
+        if command not in self.views:
+            if command == "list":
+                self.views[command] = format_entries(self.entries.values())
+            elif command == "summary":
+                self.views[command] = format_totals(self.totals)
+            else:
+                raise ValueError(f"지원하지 않는 명령입니다: {command}")
+        return self.views[command]
+
+    def check_request(self, request: dict[str, object]) -> None:
+        data = request.get("data")
+        if data is not None and Path(str(data)).resolve() != self.path.resolve():
+            raise OtherDataError(f"서버의 데이터 파일과 다릅니다: {self.path}")
+        durability = self.committer.durability
+        requested = request.get("durability")
+        if isinstance(requested, dict) and Durability(**requested) != durability:
+            raise OtherDataError(f"서버의 기록 보장 수준과 다릅니다: {durability.mode}")
+
+    def handle(self, request: dict[str, object]) -> list[str]:
+        self.check_request(request)
+        command = request.get("command")
+        if command == "add":
+            entry = make_entry(
+                str(request["week_start"]), str(request["category"]), str(request["days"])
+            )
+            return format_added(entry, self.add(entry))
+        entry_filter = request_filter(request)
+        with self.lock:
+            self.refresh()
+            if entry_filter is None:
+                return self.view(str(command))
+            return self.filtered_view(str(command), entry_filter)
+
+    def filtered_view(self, command: str, entry_filter: EntryFilter) -> list[str]:
+        entries = [
+            entry
+            for entry in self.entries.values()
+            if entry_filter.matches(entry.week_start, entry.category)
+        ]
+        if command == "list":
+            return format_entries(entries)
+        if command == "summary":
+            return format_totals(summarize_by_week(entries))
+        raise ValueError(f"지원하지 않는 명령입니다: {command}")
+
+
+def request_filter(request: dict[str, object]) -> EntryFilter | None:
+    start, end, categories = request.get("from"), request.get("to"), request.get("categories")
+    if start is None and end is None and not categories:
+        return None
+    return EntryFilter(
+        None if start is None else parse_week_start(str(start)),
+        None if end is None else parse_week_start(str(end)),
+        frozenset(map(str, categories)) if isinstance(categories, list) and categories else None,
+    )
+
+
+class TrackerRequestHandler(socketserver.StreamRequestHandler):
+    server: TrackerServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                lines = self.server.state.handle(json.loads(line))
+                response: dict[str, object] = {"ok": True, "lines": lines}
+            except OtherDataError as exc:
+                # The client then runs the command on its own data file.
+                response = {"ok": False, "error": str(exc), "local": True}
+            except (argparse.ArgumentTypeError, KeyError, TypeError, ValueError) as exc:
+                response = {"ok": False, "error": str(exc)}
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class TrackerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, state: TrackerState) -> None:
+        self.state = state
+        super().__init__(str(socket_path), TrackerRequestHandler)
+
+
+def serve(
+    data_path: Path, socket_path: Path, durability: Durability, sketch_path: Path
+) -> None:
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    state = TrackerState(data_path, durability, sketch_path)
+    with TrackerServer(socket_path, state) as server:
+        print(f"서버 시작: {socket_path} ({data_path}, {len(state.entries)}건)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def entry_payload(entry: RoutineEntry) -> dict[str, object]:
+    return {
+        "week_start": entry.week_start.strftime(DATE_FMT),
+        "category": entry.category,
+        "days": entry.days,
+        "score": entry.score,
+    }
+
+
+def totals_payload(totals: dict[date, float]) -> list[dict[str, object]]:
+    weeks = sorted(totals.keys())
+    grades = grades_for_scores([totals[week_start] for week_start in weeks])
+    return [
+        {
+            "week_start": week_start.strftime(DATE_FMT),
+            "label": week_label(week_start),
+            "total": round(totals[week_start], 2),
+            "grade": grade,
+        }
+        for week_start, grade in zip(weeks, grades)
+    ]
+
+
+def json_bytes(payload: object) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+class TrackerHttpApi:
+    """Minimal asyncio HTTP/1.1 JSON API over a shared TrackerState."""
+
+    def __init__(self, state: TrackerState, report_path: Path, plot_path: Path) -> None:
+        self.state = state
+        self.report_path = report_path
+        self.plot_path = plot_path
+
+    def cached(self, name: str, build: Callable[[], object]) -> bytes:
+        with self.state.lock:
+            self.state.refresh()
+            if name not in self.state.views:
+                self.state.views[name] = json_bytes(build())
+            return self.state.views[name]
+
+    def add(self, body: bytes) -> tuple[int, bytes]:
+        request = json.loads(body or b"{}")
+        entry = make_entry(
+            str(request["week_start"]), str(request["category"]), str(request["days"])
+        )
+        total_score = self.state.add(entry)
+        payload = {
+            "entry": entry_payload(entry),
+            "week_total": round(total_score, 2),
+            "grade": grade_for_score(total_score),
+        }
+        return 201, json_bytes(payload)
+
+    def report(self) -> tuple[int, bytes]:
+        with self.state.lock:
+            self.state.refresh()
+            series = aggregate_scores(self.state.entries.values())
+        if not series.totals:
+            return 404, json_bytes({"error": "등록된 루틴 점수가 없습니다."})
+        report_path, plot_path, used_matplotlib = write_report(
+            series, self.report_path, self.plot_path
+        )
+        payload = {
+            "report": str(report_path),
+            "plot": str(plot_path),
+            "matplotlib": used_matplotlib,
+        }
+        return 200, json_bytes(payload)
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple[int, bytes]:
+        import asyncio
+
+        # Views wait on state.lock and may reload the data file, so they run
+        # off the event loop like the writes below.
+        if method == "GET" and path == "/summary":
+            return 200, await asyncio.to_thread(
+                self.cached, "http:summary", lambda: {"weeks": totals_payload(self.state.totals)}
+            )
+        if method == "GET" and path == "/list":
+            return 200, await asyncio.to_thread(
+                self.cached,
+                "http:list",
+                lambda: {
+                    "entries": [
+                        entry_payload(entry)
+                        for entry in sorted(
+                            self.state.entries.values(),
+                            key=lambda item: (item.week_start, item.category),
+                        )
+                    ]
+                },
+            )
+        if method == "POST" and path == "/add":
+            return await asyncio.to_thread(self.add, body)
+        if method == "POST" and path == "/report":
+            return await asyncio.to_thread(self.report)
+        return 404, json_bytes({"error": f"알 수 없는 경로입니다: {method} {path}"})
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        import asyncio
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+
+                try:
+                    status, payload = await self.dispatch(
+                        method, urlsplit(target).path, body
+                    )
+                except KeyError as exc:
+                    status, payload = 400, json_bytes(
+                        {"error": f"필수 항목이 없습니다: {exc.args[0]}"}
+                    )
+                except (argparse.ArgumentTypeError, TypeError, ValueError) as exc:
+                    status, payload = 400, json_bytes({"error": str(exc)})
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                        "Content-Type: application/json; charset=utf-8\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run_http_api(api: TrackerHttpApi, host: str, port: int) -> None:
+    import asyncio
+
+    server = await asyncio.start_server(api.handle, host, port)
+    async with server:
+        print(f"HTTP API 시작: http://{host}:{port} ({api.state.path})", flush=True)
+        await server.serve_forever()
+
+
+def serve_http(
+    data_path: Path,
+    host: str,
+    port: int,
+    report_path: Path,
+    plot_path: Path,
+    durability: Durability,
+    sketch_path: Path,
+) -> None:
+    import asyncio
+
+    api = TrackerHttpApi(
+        TrackerState(data_path, durability, sketch_path), report_path, plot_path
+    )
+    try:
+        asyncio.run(run_http_api(api, host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+def client_request(args: argparse.Namespace) -> dict[str, object] | None:
+    request: dict[str, object] = {"command": args.command, "data": str(args.data.resolve())}
+    if args.command == "add":
+        request.update(
+            week_start=args.week_start.strftime(DATE_FMT),
+            category=args.category,
+            days=args.days,
+            durability=dataclasses.asdict(durability_from_args(args)),
+        )
+    else:
+        if args.start is not None:
+            request["from"] = args.start.strftime(DATE_FMT)
+        if args.end is not None:
+            request["to"] = args.end.strftime(DATE_FMT)
+        if args.categories:
+            request["categories"] = args.categories
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(args.socket))
+            client.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+            with client.makefile("rb") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+    response = json.loads(line) if line else None
+    if response is not None and response.get("local"):
+        return None
+    return response
@@ -7,18 +7,88 @@ Stores weekly routine adherence counts (0-7 days) and plots score trends.
 from __future__ import annotations
 
 import argparse
+import bisect
 import csv
+import glob
+import gzip
+import hashlib
+import importlib.util
+import io
+import itertools
+import json
+import mmap
 import os
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
 from collections import defaultdict
-from dataclasses import dataclass
+from contextlib import closing, contextmanager
+from dataclasses import FrozenInstanceError, dataclass
 from datetime import date, datetime
+from functools import lru_cache, partial
+from html import escape as html_escape
 from pathlib import Path
-from typing import Iterable
+from types import ModuleType
+from typing import IO, TYPE_CHECKING, Callable, Iterable, Iterator, Sequence, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory flock
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    import numpy as np
+    from matplotlib.lines import Line2D
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 DEFAULT_DATA_PATH = Path("data/routines.csv")
 DEFAULT_PLOT_PATH = Path("plots/score_trend.png")
 DEFAULT_REPORT_PATH = Path("reports/weekly_report.html")
+DEFAULT_SOCKET_PATH = Path("data/routines.sock")
+DEFAULT_SKETCH_PATH = Path("data/population.sketch")
 DATE_FMT = "%Y-%m-%d"
+SVG_WIDTH, SVG_HEIGHT, SVG_PADDING = 800, 400, 50
+SVG_SUFFIXES = (".svg", ".svgz")
+SVG_TOTAL_COLOR = "#1f77b4"
+SVG_PALETTE = ("#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b")
+SVG_MAX_X_LABELS = 12
+MARKER_MAX_POINTS = 60
+TOTALS_SUFFIX = ".totals"
+TOTALS_VERSION = 2
+LOCK_SUFFIX = ".lock"
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+INDEX_BLOCK_BYTES = 64 << 10
+INDEX_MIN_BYTES = 1 << 20
+RENDER_HASH_SUFFIX = ".hash"
+RENDER_CACHE_VERSION = 2
+DURABILITY_MODES = ("none", "batch", "always")
+DEFAULT_FSYNC_EVERY = 1000
+DEFAULT_FSYNC_INTERVAL_MS = 100.0
+SQLITE_SYNCHRONOUS = {"none": "OFF", "batch": "NORMAL", "always": "FULL"}
+SCHEMA_VERSION = 2
+IMPORT_REJECT_PREVIEW = 20
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+RTB_SUFFIX = ".rtb"
+DATA_SUFFIXES = (".csv", RTB_SUFFIX, *SQLITE_SUFFIXES)
+CSV_HEADER = b"week_start,category,days,score\r\n"
+CSV_CHUNK_BYTES = 1 << 20
+PARALLEL_MIN_BYTES = 32 << 20
+# .rtb: 4-byte magic, then fixed 11-byte little-endian records of
+# (week ordinal int32, category code uint8, days int16, score float32).
+RTB_MAGIC = b"RTB1"
+RTB_RECORD = struct.Struct("<iBhf")
+RTB_DTYPE = [("week", "<i4"), ("category", "u1"), ("days", "<i2"), ("score", "<f4")]
+COLUMNAR_MIN_BYTES = 1 << 20
+COLUMNAR_MIN_ROWS = 10_000
+CLIENT_COMMANDS = ("add", "list", "summary")
 
 CATEGORY_WEIGHTS: dict[str, int] = {
     "생활리듬": 30,
@@ -45,14 +115,157 @@ GRADE_THRESHOLDS: list[tuple[int, str]] = [
     (0, "주의등급"),
 ]
 
+GRADE_PERCENTILES: list[tuple[float, str]] = [
+    (0.1, "SS등급(상위 0.1%)"),
+    (1, "S등급(상위 1%)"),
+    (5, "A등급(상위 5%)"),
+    (10, "B등급(상위 10%)"),
+    (20, "C등급(상위 20%)"),
+    (30, "D등급(상위 30%)"),
+]
+SKETCH_RESOLUTION = 0.1
+SKETCH_BINS = 1001
+
+CATEGORIES: tuple[str, ...] = tuple(CATEGORY_WEIGHTS)
+CATEGORY_CODES: dict[str, int] = {name: code for code, name in enumerate(CATEGORIES)}
+MAX_DAYS = 84
+
 
-@dataclass(frozen=True)
 class RoutineEntry:
+    """Frozen weekly record with a compact per-row footprint.
+
+    The category is stored as its index in CATEGORIES, and the CSV loader
+    shares week_start dates and score floats between rows through its parse
+    caches, so a loaded entry costs one 64-byte slotted object (~78 bytes/row
+    including the list slot) instead of ~224 bytes for the old dataclass.
+    """
+
+    __slots__ = ("week_start", "_code", "days", "score")
+
     week_start: date
-    category: str
     days: int
     score: float
 
+    def __init__(self, week_start: date, category: str, days: int, score: float) -> None:
+        object.__setattr__(self, "week_start", week_start)
+        object.__setattr__(self, "_code", CATEGORY_CODES[category])
+        object.__setattr__(self, "days", days)
+        object.__setattr__(self, "score", score)
+
+    @property
+    def category(self) -> str:
+        return CATEGORIES[self._code]
+
+    def _key(self) -> tuple[date, int, int, float]:
+        return (self.week_start, self._code, self.days, self.score)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"RoutineEntry(week_start={self.week_start!r}, category={self.category!r}, "
+            f"days={self.days!r}, score={self.score!r})"
+        )
+
+    def __reduce__(self) -> tuple[type[RoutineEntry], tuple[date, str, int, float]]:
+        return (RoutineEntry, (self.week_start, self.category, self.days, self.score))
+
+
+@dataclass(frozen=True)
+class Durability:
+    """When appended rows are forced to disk.
+
+    ``none`` leaves it to the OS, ``always`` fsyncs every row and ``batch``
+    fsyncs every ``every`` rows or ``interval_ms`` milliseconds, and once more
+    before the write returns.
+    """
+
+    mode: str = "batch"
+    every: int = DEFAULT_FSYNC_EVERY
+    interval_ms: float = DEFAULT_FSYNC_INTERVAL_MS
+
+    def due(self, pending: int, last_sync: float) -> bool:
+        if self.mode == "always":
+            return True
+        if self.mode == "none":
+            return False
+        return (
+            pending >= self.every
+            or (time.monotonic() - last_sync) * 1000 >= self.interval_ms
+        )
+
+
+DEFAULT_DURABILITY = Durability()
+
+
+@dataclass(frozen=True)
+class AppendResult:
+    """Rows written plus the data file stamp seen under the lock around the write.
+
+    A caller that mirrors the file in memory can trust ``after`` only if
+    ``before`` matches the stamp it last loaded; otherwise another process
+    wrote in between and the file has to be read again.
+    """
+
+    count: int
+    before: list[int] | None
+    after: list[int] | None
+
+
+@dataclass(frozen=True)
+class EntryFilter:
+    """Week range (inclusive) and category subset applied while loading."""
+
+    start: date | None = None
+    end: date | None = None
+    categories: frozenset[str] | None = None
+
+    def matches(self, week_start: date, category: str) -> bool:
+        return (
+            (self.start is None or week_start >= self.start)
+            and (self.end is None or week_start <= self.end)
+            and (self.categories is None or category in self.categories)
+        )
+
+    def week_keys(self) -> tuple[bytes, bytes]:
+        # ISO dates sort as bytes, so CSV rows can be rejected before parsing.
+        return (
+            b"" if self.start is None else self.start.isoformat().encode(),
+            b"\xff" if self.end is None else self.end.isoformat().encode(),
+        )
+
+    def sql(self) -> tuple[str, list[object]]:
+        clauses: list[str] = []
+        params: list[object] = []
+        if self.start is not None:
+            clauses.append("week_start >= ?")
+            params.append(self.start.strftime(DATE_FMT))
+        if self.end is not None:
+            clauses.append("week_start <= ?")
+            params.append(self.end.strftime(DATE_FMT))
+        if self.categories is not None:
+            clauses.append(f"category IN ({', '.join('?' * len(self.categories))})")
+            params.extend(sorted(self.categories))
+        return (f"WHERE {' AND '.join(clauses)} " if clauses else ""), params
+
+
+@dataclass(frozen=True)
+class ScoreSeries:
+    totals: dict[date, float]
+    categories: dict[str, dict[date, float]]
+
 
 def parse_date(value: str) -> date:
     try:
@@ -63,6 +276,21 @@ def parse_date(value: str) -> date:
         ) from exc
 
 
+@lru_cache(maxsize=8192)
+def parse_week_start(value: str) -> date:
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    return parse_date(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_score(value: str) -> float:
+    return float(value)
+
+
 def parse_days(value: str) -> int:
     try:
         days = int(value)
@@ -76,11 +304,98 @@ def parse_days(value: str) -> int:
 
 
 def ensure_csv(path: Path) -> None:
+    create_with_header(path, CSV_HEADER)
+
+
+def ensure_rtb(path: Path) -> None:
+    create_with_header(path, RTB_MAGIC)
+
+
+def create_with_header(path: Path, header: bytes) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    if not path.exists():
-        with path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.writer(handle)
-            writer.writerow(["week_start", "category", "days", "score"])
+    if path.exists():
+        return
+
+    # Publish the header with link(2) so concurrent creators never see (or
+    # produce) an empty or doubly-headed file.
+    tmp_name = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(header)
+        try:
+            os.link(tmp_name, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.unlink(tmp_name)
+
+
+@contextmanager
+def locked(path: Path) -> Iterator[None]:
+    # Advisory lock on a sibling file: compact replaces the data file itself.
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + LOCK_SUFFIX), "a") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def is_sqlite_path(path: Path) -> bool:
+    return path.suffix.lower() in SQLITE_SUFFIXES
+
+
+def is_rtb_path(path: Path) -> bool:
+    return path.suffix.lower() == RTB_SUFFIX
+
+
+def connect_db(path: Path, durability: Durability | None = None) -> sqlite3.Connection:
+    import sqlite3
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path)
+    if durability is not None:
+        # SQLite keeps its own log; batch maps to WAL with NORMAL sync, which
+        # only fsyncs at checkpoints.
+        if durability.mode == "batch":
+            connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS[durability.mode]}")
+    (version,) = connection.execute("PRAGMA user_version").fetchone()
+    if version < SCHEMA_VERSION:
+        # Version 1 allowed duplicate keys; keep only the latest row per key.
+        connection.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                week_start TEXT NOT NULL,
+                category TEXT NOT NULL,
+                days INTEGER NOT NULL,
+                score REAL NOT NULL
+            );
+            DELETE FROM entries WHERE id NOT IN (
+                SELECT MAX(id) FROM entries GROUP BY week_start, category
+            );
+            DROP INDEX IF EXISTS idx_entries_week_category;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_key
+                ON entries (week_start, category);
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """
+        )
+    return connection
+
+
+def ensure_storage(path: Path) -> None:
+    if is_sqlite_path(path):
+        connect_db(path).close()
+    elif is_rtb_path(path):
+        ensure_rtb(path)
+    else:
+        ensure_csv(path)
 
 
 def calculate_score(category: str, days: int) -> float:
@@ -88,7 +403,7 @@ def calculate_score(category: str, days: int) -> float:
         weight = CATEGORY_WEIGHTS[category]
         return round((days / 84) * weight, 2)
 
-    return SCORE_TABLES[category][days]
+    return float(SCORE_TABLES[category][days])
 
 
 def validate_days(category: str, days: int) -> None:
@@ -101,234 +416,1465 @@ def validate_days(category: str, days: int) -> None:
         raise argparse.ArgumentTypeError("일수는 0부터 7 사이여야 합니다.")
 
 
-def append_entry(path: Path, entry: RoutineEntry) -> None:
-    ensure_csv(path)
-    with path.open("a", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(
-            [
-                entry.week_start.strftime(DATE_FMT),
-                entry.category,
-                entry.days,
-                entry.score,
-            ]
+def entry_row(entry: RoutineEntry) -> list[object]:
+    return [
+        entry.week_start.strftime(DATE_FMT),
+        entry.category,
+        entry.days,
+        entry.score,
+    ]
+
+
+def pack_rtb(entry: RoutineEntry) -> bytes:
+    return RTB_RECORD.pack(
+        entry.week_start.toordinal(), CATEGORY_CODES[entry.category], entry.days, entry.score
+    )
+
+
+def sync_file(handle: IO[str] | IO[bytes]) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+def write_synced(
+    handle: IO[str] | IO[bytes],
+    items: Iterable[T],
+    write: Callable[[T], object],
+    durability: Durability,
+) -> int:
+    count = 0
+    pending = 0
+    last_sync = time.monotonic()
+    for item in items:
+        write(item)
+        count += 1
+        pending += 1
+        if durability.due(pending, last_sync):
+            sync_file(handle)
+            pending = 0
+            last_sync = time.monotonic()
+    if pending and durability.mode != "none":
+        sync_file(handle)
+    return count
+
+
+def append_entries(
+    path: Path,
+    entries: Iterable[RoutineEntry],
+    durability: Durability = DEFAULT_DURABILITY,
+) -> AppendResult:
+    if is_sqlite_path(path):
+        return append_entries_sqlite(path, entries, durability)
+
+    # CSV and .rtb files are append-only, so each doubles as its own
+    # write-ahead log: a crash can at worst leave a torn last row, which is
+    # cut before appending.
+    with locked(path):
+        seen = data_stamp(path) if path.exists() else None
+        rtb = is_rtb_path(path)
+        if rtb:
+            ensure_rtb(path)
+            repair_rtb_tail(path)
+        else:
+            ensure_csv(path)
+            repair_csv_tail(path)
+        before = data_stamp(path)
+        scores = load_week_scores(path)
+
+        def tracked() -> Iterator[RoutineEntry]:
+            for entry in entries:
+                if scores is not None:
+                    scores.setdefault(entry.week_start, {})[entry.category] = entry.score
+                yield entry
+
+        if rtb:
+            with path.open("ab", buffering=1 << 20) as binary:
+                count = write_synced(
+                    binary, map(pack_rtb, tracked()), binary.write, durability
+                )
+        else:
+            with path.open("a", newline="", encoding="utf-8", buffering=1 << 20) as handle:
+                writer = csv.writer(handle)
+                count = write_synced(
+                    handle, map(entry_row, tracked()), writer.writerow, durability
+                )
+        after = data_stamp(path)
+
+        if scores is None:
+            rebuild_week_scores(path)
+        else:
+            write_week_scores(path, scores, data_stamp(path))
+        if not rtb:
+            extend_week_index(path, before)
+    return AppendResult(count, seen, after)
+
+
+def csv_tail_is_complete(tail: bytes) -> bool:
+    try:
+        fields = next(csv.reader([tail.decode("utf-8")]))
+        week_start, category, days, score = fields
+        return make_entry(week_start, category, days).score == float(score)
+    except (StopIteration, UnicodeDecodeError, argparse.ArgumentTypeError, ValueError):
+        return False
+
+
+def repair_csv_tail(path: Path) -> bool:
+    # A last line without a newline is either a hand edit (keep it, terminate
+    # it) or a write torn by a crash (drop it). The score is the last field
+    # and derives from days, so a torn row only passes the score check when
+    # the cut kept its value ("7." of "7.0"), and terminating it loses nothing.
+    with path.open("rb+") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size == 0:
+            return False
+        handle.seek(size - 1)
+        if handle.read(1) == b"\n":
+            return False
+        start = max(0, size - 4096)
+        handle.seek(start)
+        chunk = handle.read()
+        cut = start + chunk.rfind(b"\n") + 1
+        tail = chunk[cut - start :]
+        if tail.startswith(b"week_start,") or csv_tail_is_complete(tail):
+            handle.write(b"\r\n")
+        else:
+            handle.truncate(cut)
+        return True
+
+
+def repair_rtb_tail(path: Path) -> bool:
+    size = path.stat().st_size
+    torn = (size - len(RTB_MAGIC)) % RTB_RECORD.size
+    if size < len(RTB_MAGIC) or not torn:
+        return False
+    with path.open("rb+") as handle:
+        handle.truncate(size - torn)
+    return True
+
+
+def recover_csv(path: Path) -> None:
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        handle.seek(size - 1)
+        if handle.read(1) == b"\n":
+            return
+    with locked(path):
+        repair_csv_tail(path)
+
+
+class GroupCommitter:
+    """Batches rows from concurrent threads into one append and one fsync.
+
+    The first caller to find no flush in progress becomes the leader and
+    writes every row queued so far; the others wait for that batch.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        on_commit: Callable[[list[RoutineEntry], AppendResult], None] | None = None,
+        durability: Durability = DEFAULT_DURABILITY,
+    ) -> None:
+        self.path = path
+        self.durability = durability
+        self.on_commit = on_commit
+        self.condition = threading.Condition()
+        self.pending: list[RoutineEntry] = []
+        self.flushing = False
+        self.queued_batch = 0
+        self.committed_batch = -1
+        self.errors: dict[int, BaseException] = {}
+
+    def append(self, entries: Iterable[RoutineEntry]) -> None:
+        with self.condition:
+            self.pending.extend(entries)
+            batch_id = self.queued_batch
+            while self.committed_batch < batch_id and self.flushing:
+                self.condition.wait()
+            if self.committed_batch >= batch_id:
+                self.raise_for(batch_id)
+                return
+            batch, self.pending = self.pending, []
+            self.flushing = True
+            self.queued_batch += 1
+
+        error: BaseException | None = None
+        try:
+            result = append_entries(self.path, batch, self.durability)
+            if self.on_commit is not None:
+                self.on_commit(batch, result)
+        except BaseException as exc:
+            error = exc
+        with self.condition:
+            if error is not None:
+                self.errors[batch_id] = error
+            self.committed_batch = batch_id
+            self.flushing = False
+            self.condition.notify_all()
+        self.raise_for(batch_id)
+
+    def raise_for(self, batch_id: int) -> None:
+        error = self.errors.get(batch_id)
+        if error is not None:
+            raise error
+
+
+def append_entry(
+    path: Path, entry: RoutineEntry, durability: Durability = DEFAULT_DURABILITY
+) -> None:
+    append_entries(path, [entry], durability)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def totals_path(path: Path) -> Path:
+    return path.with_name(path.name + TOTALS_SUFFIX)
+
+
+def render_hash_path(path: Path) -> Path:
+    return path.with_name(path.name + RENDER_HASH_SUFFIX)
+
+
+def render_digest(*parts: object) -> str:
+    payload = json.dumps([RENDER_CACHE_VERSION, *parts], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def series_digest(series: ScoreSeries, *options: object) -> str:
+    categories = sorted(series.categories.items())
+    return render_digest(
+        sorted(series.totals.items()),
+        [(category, sorted(scores.items())) for category, scores in categories],
+        *options,
+    )
+
+
+def render_is_current(path: Path, digest: str) -> bool:
+    try:
+        return path.exists() and render_hash_path(path).read_text(encoding="utf-8") == digest
+    except OSError:
+        return False
+
+
+@contextmanager
+def rendering(path: Path, digest: str) -> Iterator[None]:
+    # Drop the old hash first so a render that dies halfway is never trusted.
+    render_hash_path(path).unlink(missing_ok=True)
+    yield
+    write_text_atomic(render_hash_path(path), digest)
+
+
+def data_stamp(path: Path) -> list[int]:
+    info = path.stat()
+    return [info.st_size, info.st_mtime_ns]
+
+
+def load_week_scores(path: Path) -> dict[date, dict[str, float]] | None:
+    sidecar = totals_path(path)
+    if not path.exists() or not sidecar.exists():
+        return None
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != TOTALS_VERSION or payload.get("stamp") != data_stamp(path):
+        return None
+    return {
+        date.fromisoformat(week_start): categories
+        for week_start, categories in payload["weeks"].items()
+    }
+
+
+def write_week_scores(
+    path: Path, scores: dict[date, dict[str, float]], stamp: list[int]
+) -> None:
+    payload = {
+        "version": TOTALS_VERSION,
+        "stamp": stamp,
+        "weeks": {
+            week_start.strftime(DATE_FMT): categories
+            for week_start, categories in sorted(scores.items())
+        },
+    }
+    write_text_atomic(totals_path(path), json.dumps(payload, ensure_ascii=False))
+
+
+def rebuild_week_scores(path: Path, jobs: int | None = 1) -> dict[date, dict[str, float]]:
+    # Stamp before reading: a concurrent append then leaves the cache stale
+    # rather than silently missing its row.
+    stamp = data_stamp(path) if path.exists() else None
+    scores: dict[date, dict[str, float]] = defaultdict(dict)
+    for category, weeks in load_score_series(path, jobs).categories.items():
+        for week_start, score in weeks.items():
+            scores[week_start][category] = score
+    if stamp is not None:
+        write_week_scores(path, scores, stamp)
+    return dict(scores)
+
+
+def week_totals(
+    path: Path, jobs: int | None = 1, entry_filter: EntryFilter | None = None
+) -> dict[date, float]:
+    if is_sqlite_path(path):
+        return week_totals_sqlite(path, entry_filter)
+
+    scores = load_week_scores(path)
+    if scores is None:
+        scores = rebuild_week_scores(path, jobs)
+    if entry_filter is None:
+        return {
+            week_start: sum(categories.values()) for week_start, categories in scores.items()
+        }
+    totals: dict[date, float] = {}
+    for week_start, categories in scores.items():
+        matched = [
+            score
+            for category, score in categories.items()
+            if entry_filter.matches(week_start, category)
+        ]
+        if matched:
+            totals[week_start] = sum(matched)
+    return totals
+
+
+def week_total(path: Path, week_start: date) -> float | None:
+    if is_sqlite_path(path):
+        with closing(connect_db(path)) as connection:
+            (total,) = connection.execute(
+                "SELECT SUM(score) FROM entries WHERE week_start = ?",
+                (week_start.strftime(DATE_FMT),),
+            ).fetchone()
+        return total
+    return week_totals(path).get(week_start)
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def load_week_index(path: Path, stamp: list[int]) -> list[list] | None:
+    try:
+        payload = json.loads(index_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != INDEX_VERSION or payload.get("stamp") != stamp:
+        return None
+    return payload["blocks"]
+
+
+def write_week_index(path: Path, blocks: list[list], stamp: list[int]) -> None:
+    payload = {"version": INDEX_VERSION, "stamp": stamp, "blocks": blocks}
+    write_text_atomic(index_path(path), json.dumps(payload, separators=(",", ":")))
+
+
+def index_blocks(buffer: mmap.mmap, start: int, end: int) -> list[list]:
+    # One [offset, min week, max week] entry per ~64 KiB of whole lines.
+    # Weeks are kept as ISO strings; a line without a leading ISO date makes
+    # its block match every range.
+    blocks: list[list] = []
+    position = start
+    while position < end:
+        stop = min(position + INDEX_BLOCK_BYTES, end)
+        if stop < end:
+            newline = buffer.find(b"\n", stop, end)
+            stop = end if newline < 0 else newline + 1
+        lines = [line for line in buffer[position:stop].split(b"\n") if line.strip()]
+        weeks = [line[:10] for line in lines if line[10:11] == b","]
+        if len(weeks) < len(lines):
+            blocks.append([position, "", "~"])
+        elif weeks:
+            blocks.append([position, min(weeks).decode(), max(weeks).decode()])
+        position = stop
+    return blocks
+
+
+def extend_week_index(path: Path, before: list[int]) -> None:
+    # Called under the data file lock right after an append: only the last
+    # (possibly partial) block and the new rows are indexed again.
+    blocks = load_week_index(path, before)
+    if blocks is None:
+        return
+    start = blocks.pop()[0] if blocks else len(CSV_HEADER)
+    stamp = data_stamp(path)
+    with path.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        blocks.extend(index_blocks(mapped, start, stamp[0]))
+    write_week_index(path, blocks, stamp)
+
+
+def week_index_ranges(
+    path: Path, buffer: mmap.mmap, start: int, end: int, entry_filter: EntryFilter
+) -> list[tuple[int, int]]:
+    if end < INDEX_MIN_BYTES:
+        return [(start, end)]
+    stamp = data_stamp(path)
+    blocks = load_week_index(path, stamp) if stamp[0] == end else None
+    if blocks is None:
+        blocks = index_blocks(buffer, start, end)
+        if stamp[0] == end:
+            write_week_index(path, blocks, stamp)
+    if not blocks:
+        return []
+
+    low = "" if entry_filter.start is None else entry_filter.start.isoformat()
+    high = "~" if entry_filter.end is None else entry_filter.end.isoformat()
+    # Running max from the front and min from the back are monotonic even
+    # when a few rows arrive out of order, so both ends are binary searches.
+    prefix_max = list(itertools.accumulate((block[2] for block in blocks), max))
+    suffix_min = list(itertools.accumulate((block[1] for block in reversed(blocks)), min))
+    suffix_min.reverse()
+    first = bisect.bisect_left(prefix_max, low)
+    last = bisect.bisect_right(suffix_min, high)
+
+    ranges: list[tuple[int, int]] = []
+    for index in range(first, last):
+        offset, block_low, block_high = blocks[index]
+        if block_high < low or block_low > high:
+            continue
+        stop = blocks[index + 1][0] if index + 1 < len(blocks) else end
+        if ranges and ranges[-1][1] == offset:
+            ranges[-1] = (ranges[-1][0], stop)
+        else:
+            ranges.append((offset, stop))
+    return ranges
+
+
+def append_entries_sqlite(
+    path: Path, entries: Iterable[RoutineEntry], durability: Durability = DEFAULT_DURABILITY
+) -> AppendResult:
+    seen = data_stamp(path) if path.exists() else None
+    with closing(connect_db(path, durability)) as connection, connection:
+        cursor = connection.executemany(
+            "INSERT INTO entries (week_start, category, days, score) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (week_start, category) "
+            "DO UPDATE SET days = excluded.days, score = excluded.score",
+            (entry_row(entry) for entry in entries),
         )
+        count = cursor.rowcount
+    return AppendResult(count, seen, data_stamp(path))
 
 
-def load_entries(path: Path) -> list[RoutineEntry]:
+def week_totals_sqlite(path: Path, entry_filter: EntryFilter | None = None) -> dict[date, float]:
     if not path.exists():
-        return []
+        return {}
+    where, params = entry_filter.sql() if entry_filter is not None else ("", [])
+    with closing(connect_db(path)) as connection:
+        rows = connection.execute(
+            f"SELECT week_start, SUM(score) FROM entries {where}GROUP BY week_start", params
+        ).fetchall()
+    return {parse_week_start(week_start): total for week_start, total in rows}
+
+
+def iter_entries_sqlite(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[RoutineEntry]:
+    # The (week_start, category) index turns a week range into an index seek.
+    where, params = entry_filter.sql() if entry_filter is not None else ("", [])
+    with closing(connect_db(path)) as connection:
+        rows = connection.execute(
+            f"SELECT week_start, category, days, score FROM entries {where}ORDER BY id", params
+        )
+        for week_start, category, days, score in rows:
+            yield RoutineEntry(
+                week_start=parse_week_start(week_start),
+                category=category,
+                days=days,
+                score=score,
+            )
 
-    entries: list[RoutineEntry] = []
-    with path.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        for row in reader:
-            if not row:
+
+def iter_entries(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[RoutineEntry]:
+    if not path.exists():
+        return
+    if is_sqlite_path(path):
+        yield from iter_entries_sqlite(path, entry_filter)
+        return
+
+    for week_start, category, days, score in iter_rows(path, entry_filter):
+        yield RoutineEntry(
+            week_start=week_start, category=category, days=days, score=score
+        )
+
+
+def iter_rows(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[tuple[date, str, int, float]]:
+    if is_rtb_path(path):
+        return iter_rtb_rows(path, entry_filter)
+    return iter_csv_rows(path, entry_filter)
+
+
+def iter_csv_rows(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[tuple[date, str, int, float]]:
+    recover_csv(path)
+    with path.open("rb") as handle:
+        header = handle.readline()
+        if header.rstrip(b"\r\n") != CSV_HEADER.rstrip(b"\r\n"):
+            yield from iter_csv_dict_rows(path, entry_filter)
+            return
+        if handle.seek(0, os.SEEK_END) == len(header):
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = complete_rows_end(mapped, len(header))
+            ranges = [(len(header), size)]
+            if entry_filter is not None and (
+                entry_filter.start is not None or entry_filter.end is not None
+            ):
+                ranges = week_index_ranges(path, mapped, len(header), size, entry_filter)
+            for start, end in ranges:
+                yield from parse_csv_lines(mapped, start, end, entry_filter)
+
+
+def complete_rows_end(buffer: mmap.mmap, start: int) -> int:
+    # recover_csv runs before the file is mapped and without the lock, so a
+    # concurrent append may have flushed half a row since; stop at the last
+    # newline and leave that row to the next read.
+    return max(buffer.rfind(b"\n", start) + 1, start)
+
+
+def parse_csv_lines(
+    buffer: mmap.mmap, start: int, end: int, entry_filter: EntryFilter | None = None
+) -> Iterator[tuple[date, str, int, float]]:
+    # Rows are split straight from the mapped bytes and each distinct field
+    # value is decoded once, so a row costs one bytes slice per field rather
+    # than DictReader's decoded line, field strings and dict.
+    weeks: dict[bytes, date] = {}
+    categories: dict[bytes, str] = {}
+    day_counts: dict[bytes, int] = {}
+    scores: dict[bytes, float] = {}
+    low, high = entry_filter.week_keys() if entry_filter is not None else (b"", b"")
+    position = start
+    while position < end:
+        stop = min(position + CSV_CHUNK_BYTES, end)
+        if stop < end:
+            newline = buffer.rfind(b"\n", position, stop)
+            if newline < 0:
+                newline = buffer.find(b"\n", stop, end)
+            stop = end if newline < 0 else newline + 1
+        chunk = buffer[position:stop]
+        position = stop
+        for line in chunk.split(b"\n"):
+            if entry_filter is not None and line[10:11] == b",":
+                if not low <= line[:10] <= high:
+                    continue
+            fields = line.split(b",")
+            if len(fields) != 4 or b'"' in line:
+                row = parse_quoted_line(line)
+                if row is not None and (entry_filter is None or entry_filter.matches(*row[:2])):
+                    yield row
                 continue
-            week_start = parse_date(row["week_start"])
-            category = row["category"].strip()
+            week, category_field, day_field, score_field = fields
+            week_start = weeks.get(week)
+            if week_start is None:
+                week_start = weeks[week] = parse_week_start(week.decode())
+            category = categories.get(category_field)
+            if category is None:
+                category = categories[category_field] = category_field.decode().strip()
             if category not in CATEGORY_WEIGHTS:
                 continue
-            days = parse_days(row["days"])
+            if entry_filter is not None and not entry_filter.matches(week_start, category):
+                continue
+            days = day_counts.get(day_field)
+            if days is None:
+                days = day_counts[day_field] = parse_days(day_field.decode())
             validate_days(category, days)
-            score = float(row["score"])
-            entries.append(
-                RoutineEntry(
-                    week_start=week_start, category=category, days=days, score=score
-                )
+            score = scores.get(score_field)
+            if score is None:
+                score = scores[score_field] = float(score_field)
+            yield week_start, category, days, score
+
+
+def parse_quoted_line(line: bytes) -> tuple[date, str, int, float] | None:
+    row = next(csv.reader([line.decode("utf-8")]), None)
+    if not row or not any(field.strip() for field in row):
+        return None
+    if len(row) < 4:
+        raise ValueError(f"CSV 행의 항목 수가 부족합니다: {line.decode('utf-8', 'replace')}")
+    return parse_csv_fields(row[0], row[1], row[2], row[3])
+
+
+def parse_csv_fields(
+    week: str, category: str, days: str, score: str
+) -> tuple[date, str, int, float] | None:
+    week_start = parse_week_start(week)
+    category = category.strip()
+    if category not in CATEGORY_WEIGHTS:
+        return None
+    day_count = parse_days(days)
+    validate_days(category, day_count)
+    return week_start, category, day_count, parse_score(score)
+
+
+def iter_csv_dict_rows(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[tuple[date, str, int, float]]:
+    # Files with a reordered or extended header go through the csv module.
+    with path.open("r", newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            if not row:
+                continue
+            parsed = parse_csv_fields(
+                row["week_start"], row["category"], row["days"], row["score"]
             )
+            if parsed is not None and (
+                entry_filter is None or entry_filter.matches(parsed[0], parsed[1])
+            ):
+                yield parsed
+
+
+def csv_chunk_ranges(path: Path, parts: int) -> list[tuple[int, int]] | None:
+    recover_csv(path)
+    with path.open("rb") as handle:
+        header = handle.readline()
+        if header.rstrip(b"\r\n") != CSV_HEADER.rstrip(b"\r\n"):
+            return None
+        if handle.seek(0, os.SEEK_END) == len(header):
+            return []
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            size = complete_rows_end(mapped, len(header))
+            bounds = [len(header)]
+            for part in range(1, parts):
+                newline = mapped.find(b"\n", len(header) + (size - len(header)) * part // parts)
+                bounds.append(size if newline < 0 else newline + 1)
+            bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def latest_scores_in_range(
+    job: tuple[Path, int, int, EntryFilter | None],
+) -> dict[tuple[date, str], float]:
+    path, start, end, entry_filter = job
+    with path.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return latest_scores(parse_csv_lines(mapped, start, end, entry_filter))
+
+
+def aggregate_chunks(
+    path: Path,
+    ranges: list[tuple[int, int]],
+    jobs: int,
+    entry_filter: EntryFilter | None = None,
+) -> ScoreSeries:
+    # Chunks are merged in file order, so later rows still replace earlier
+    # ones for the same (week_start, category).
+    latest: dict[tuple[date, str], float] = {}
+    work = [(path, start, end, entry_filter) for start, end in ranges]
+    for part in map_parallel(latest_scores_in_range, work, jobs):
+        latest.update(part)
+    return series_from_latest(latest)
+
+
+def rtb_record_count(path: Path) -> int:
+    with path.open("rb") as handle:
+        magic = handle.read(len(RTB_MAGIC))
+        size = handle.seek(0, os.SEEK_END)
+    if magic != RTB_MAGIC:
+        raise ValueError(f"RTB 파일 형식이 아닙니다: {path}")
+    # A torn trailing record from an interrupted append is ignored.
+    return (size - len(RTB_MAGIC)) // RTB_RECORD.size
+
+
+def iter_rtb_rows(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> Iterator[tuple[date, str, int, float]]:
+    count = rtb_record_count(path)
+    if not count:
+        return
+    end = len(RTB_MAGIC) + count * RTB_RECORD.size
+    weeks: dict[int, date] = {}
+    low, high, codes = rtb_bounds(entry_filter)
+    with path.open("rb") as handle, mmap.mmap(
+        handle.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        with memoryview(mapped)[len(RTB_MAGIC) : end] as records:
+            for ordinal, code, days, score in RTB_RECORD.iter_unpack(records):
+                if not low <= ordinal <= high or code not in codes:
+                    continue
+                week_start = weeks.get(ordinal)
+                if week_start is None:
+                    week_start = weeks[ordinal] = date.fromordinal(ordinal)
+                # float32 storage rounds 2-decimal scores; restore them.
+                yield week_start, CATEGORIES[code], days, round(score, 2)
+
+
+def rtb_bounds(entry_filter: EntryFilter | None) -> tuple[int, int, frozenset[int]]:
+    if entry_filter is None:
+        entry_filter = EntryFilter()
+    categories = CATEGORIES if entry_filter.categories is None else entry_filter.categories
+    return (
+        0 if entry_filter.start is None else entry_filter.start.toordinal(),
+        date.max.toordinal() if entry_filter.end is None else entry_filter.end.toordinal(),
+        frozenset(CATEGORY_CODES[category] for category in categories),
+    )
+
 
-    return entries
+def load_entries(path: Path) -> list[RoutineEntry]:
+    return list(iter_entries(path))
 
 
 def summarize_by_week(entries: Iterable[RoutineEntry]) -> dict[date, float]:
-    totals: dict[date, float] = defaultdict(float)
-    for entry in entries:
-        totals[entry.week_start] += entry.score
-    return dict(totals)
+    return aggregate_scores(entries).totals
+
+
+def current_entries(entries: Iterable[RoutineEntry]) -> list[RoutineEntry]:
+    latest = {(entry.week_start, entry.category): entry for entry in entries}
+    return list(latest.values())
 
 
 def summarize_by_category(
     entries: Iterable[RoutineEntry],
 ) -> dict[str, dict[date, float]]:
-    categories: dict[str, dict[date, float]] = defaultdict(lambda: defaultdict(float))
+    return aggregate_scores(entries).categories
+
+
+def aggregate_scores(entries: Iterable[RoutineEntry]) -> ScoreSeries:
+    # Later rows for the same (week_start, category) replace earlier ones.
+    latest: dict[tuple[date, str], float] = {}
     for entry in entries:
-        categories[entry.category][entry.week_start] += entry.score
-    return {category: dict(weeks) for category, weeks in categories.items()}
+        latest[(entry.week_start, entry.category)] = entry.score
+    return series_from_latest(latest)
+
+
+def series_from_latest(latest: dict[tuple[date, str], float]) -> ScoreSeries:
+    totals: dict[date, float] = defaultdict(float)
+    categories: dict[str, dict[date, float]] = defaultdict(dict)
+    for (week_start, category), score in latest.items():
+        totals[week_start] += score
+        categories[category][week_start] = score
+    return ScoreSeries(totals=dict(totals), categories=dict(categories))
+
+
+def aggregate_scores_sqlite(
+    path: Path, entry_filter: EntryFilter | None = None
+) -> ScoreSeries:
+    totals: dict[date, float] = defaultdict(float)
+    categories: dict[str, dict[date, float]] = defaultdict(dict)
+    where, params = entry_filter.sql() if entry_filter is not None else ("", [])
+    with closing(connect_db(path)) as connection:
+        rows = connection.execute(
+            f"SELECT week_start, category, SUM(score) FROM entries {where}"
+            "GROUP BY week_start, category",
+            params,
+        )
+        for week_start, category, score in rows:
+            week = parse_week_start(week_start)
+            totals[week] += score
+            categories[category][week] = score
+    return ScoreSeries(totals=dict(totals), categories=dict(categories))
+
+
+def load_score_series(
+    path: Path, jobs: int | None = 1, entry_filter: EntryFilter | None = None
+) -> ScoreSeries:
+    if not path.exists():
+        return aggregate_scores(())
+    if is_sqlite_path(path):
+        return aggregate_scores_sqlite(path, entry_filter)
+    size = path.stat().st_size
+    workers = jobs or os.cpu_count() or 1
+    # A week range is served by the sparse index instead, which usually
+    # leaves far less than a full scan to split.
+    seeks = entry_filter is not None and (
+        entry_filter.start is not None or entry_filter.end is not None
+    )
+    if workers > 1 and not is_rtb_path(path) and not seeks and size >= PARALLEL_MIN_BYTES:
+        ranges = csv_chunk_ranges(path, workers)
+        if ranges is not None:
+            return aggregate_chunks(path, ranges, workers, entry_filter)
+    # CSV rows are parsed in Python either way, so only .rtb files, which
+    # map straight into arrays, gain from the columnar path.
+    if is_rtb_path(path) and use_numpy(size, COLUMNAR_MIN_BYTES):
+        return aggregate_table(rtb_entry_table(path, entry_filter))
+    return series_from_latest(latest_scores(iter_rows(path, entry_filter)))
+
+
+def latest_scores(rows: Iterable[tuple[date, str, int, float]]) -> dict[tuple[date, str], float]:
+    # Later rows for the same (week_start, category) replace earlier ones.
+    return {(week_start, category): score for week_start, category, _, score in rows}
+
+
+@lru_cache(maxsize=None)
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+@lru_cache(maxsize=None)
+def matplotlib_available() -> bool:
+    return importlib.util.find_spec("matplotlib") is not None
+
+
+def use_numpy(size: int, threshold: int) -> bool:
+    # Importing NumPy costs ~100ms, more than it saves on small inputs.
+    if not numpy_available():
+        return False
+    return size >= threshold or "numpy" in sys.modules
+
+
+@lru_cache(maxsize=None)
+def score_lookup() -> np.ndarray:
+    import numpy as np
+
+    lookup = np.full((len(CATEGORIES), MAX_DAYS + 1), np.nan)
+    for code, category in enumerate(CATEGORIES):
+        limit = MAX_DAYS if category == "공부시간" else 7
+        for days in range(limit + 1):
+            lookup[code, days] = calculate_score(category, days)
+    return lookup
 
 
-def grade_for_score(score: float) -> str:
+def calculate_scores(categories: np.ndarray, days: np.ndarray) -> np.ndarray:
+    return score_lookup()[categories, days]
+
+
+def grades_for_scores(
+    scores: Sequence[float], sketch: PercentileSketch | None = None
+) -> list[str]:
+    if sketch is not None or not use_numpy(len(scores), COLUMNAR_MIN_ROWS):
+        return [grade_for_score(score, sketch) for score in scores]
+
+    import numpy as np
+
+    ascending = GRADE_THRESHOLDS[::-1]
+    thresholds = np.array([threshold for threshold, _ in ascending], dtype=np.float64)
+    labels = [label for _, label in ascending]
+    indexes = np.searchsorted(thresholds, np.asarray(scores, dtype=np.float64), side="right")
+    return [labels[index - 1] if index else "주의등급" for index in indexes.tolist()]
+
+
+@dataclass(frozen=True)
+class EntryTable:
+    weeks: np.ndarray
+    categories: np.ndarray
+    days: np.ndarray
+    scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    def latest_scores(self) -> tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+
+        keys = self.weeks.astype(np.int64) * len(CATEGORIES) + self.categories
+        # np.unique keeps the first index, so search the reversed keys to find
+        # the last row written for each (week, category).
+        unique_keys, reversed_index = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - reversed_index
+        # The float32 score column rounds 2-decimal scores, so score the kept
+        # rows again from their days.
+        return unique_keys, calculate_scores(self.categories[last], self.days[last])
+
+
+def rtb_entry_table(path: Path, entry_filter: EntryFilter | None = None) -> EntryTable:
+    import numpy as np
+
+    count = rtb_record_count(path)
+    # The record layout matches EntryTable's columns, so the mapped file is
+    # used directly with no parsing. np.memmap cannot map zero records.
+    dtype = np.dtype(RTB_DTYPE)
+    records = (
+        np.memmap(path, dtype=dtype, mode="r", offset=len(RTB_MAGIC), shape=(count,))
+        if count
+        else np.zeros(0, dtype=dtype)
+    )
+    if entry_filter is not None:
+        low, high, codes = rtb_bounds(entry_filter)
+        weeks = records["week"]
+        records = records[
+            (weeks >= low)
+            & (weeks <= high)
+            & np.isin(records["category"], np.fromiter(codes, dtype=np.uint8))
+        ]
+    return EntryTable(
+        weeks=records["week"],
+        categories=records["category"],
+        days=records["days"],
+        scores=records["score"],
+    )
+
+
+def aggregate_table(table: EntryTable) -> ScoreSeries:
+    import numpy as np
+
+    keys, scores = table.latest_scores()
+    ordinals, codes = np.divmod(keys, len(CATEGORIES))
+    # Keys are sorted, so bincount adds each week's scores in the same order
+    # as series_from_latest and gives the same totals.
+    week_ordinals, week_index = np.unique(ordinals, return_inverse=True)
+    weeks = {ordinal: date.fromordinal(ordinal) for ordinal in week_ordinals.tolist()}
+    totals = np.bincount(week_index, weights=scores, minlength=len(week_ordinals))
+    categories: dict[str, dict[date, float]] = defaultdict(dict)
+    for ordinal, code, score in zip(ordinals.tolist(), codes.tolist(), scores.tolist()):
+        categories[CATEGORIES[code]][weeks[ordinal]] = score
+    return ScoreSeries(
+        totals=dict(zip(weeks.values(), totals.tolist())), categories=dict(categories)
+    )
+
+
+def grade_for_score(score: float, sketch: PercentileSketch | None = None) -> str:
+    if sketch is not None and sketch.total:
+        top_percent = sketch.top_fraction(score) * 100
+        for percent, label in GRADE_PERCENTILES:
+            if top_percent <= percent:
+                return label
+        return "주의등급"
+
     for threshold, label in GRADE_THRESHOLDS:
         if score >= threshold:
             return label
     return "주의등급"
 
 
+class PercentileSketch:
+    """Histogram of weekly totals used to grade against the live population.
+
+    Totals live in [0, 100], so fixed 0.1-point bins give exact percentiles at
+    display resolution in constant space. Unlike t-digest/KLL, bins also
+    support removal, which ``add`` needs when it changes an existing week.
+    """
+
+    def __init__(self, counts: list[int] | None = None) -> None:
+        self.counts = counts or [0] * SKETCH_BINS
+        self.total = sum(self.counts)
+        self._at_least: list[int] | None = None
+
+    @staticmethod
+    def bin_for(score: float) -> int:
+        return min(max(round(score / SKETCH_RESOLUTION), 0), SKETCH_BINS - 1)
+
+    def add(self, score: float, count: int = 1) -> None:
+        self.counts[self.bin_for(score)] += count
+        self.total += count
+        self._at_least = None
+
+    def remove(self, score: float) -> None:
+        index = self.bin_for(score)
+        if self.counts[index]:
+            self.counts[index] -= 1
+            self.total -= 1
+            self._at_least = None
+
+    def replace(self, before: dict[date, float], after: dict[date, float]) -> None:
+        for week_start, score in after.items():
+            previous = before.get(week_start)
+            if previous == score:
+                continue
+            if previous is not None:
+                self.remove(previous)
+            self.add(score)
+
+    def top_fraction(self, score: float) -> float:
+        if self._at_least is None:
+            self._at_least = list(itertools.accumulate(reversed(self.counts)))[::-1]
+        return self._at_least[self.bin_for(score)] / self.total
+
+    def to_json(self) -> str:
+        counts = {str(index): count for index, count in enumerate(self.counts) if count}
+        return json.dumps({"resolution": SKETCH_RESOLUTION, "counts": counts})
+
+    @classmethod
+    def from_json(cls, text: str) -> PercentileSketch:
+        payload = json.loads(text)
+        counts = [0] * SKETCH_BINS
+        for index, count in payload["counts"].items():
+            counts[int(index)] = count
+        return cls(counts)
+
+
+def load_sketch(path: Path) -> PercentileSketch | None:
+    if not path.exists():
+        return None
+    return PercentileSketch.from_json(path.read_text(encoding="utf-8"))
+
+
+def save_sketch(path: Path, sketch: PercentileSketch) -> None:
+    write_text_atomic(path, sketch.to_json())
+
+
+def update_sketch(path: Path, before: dict[date, float], after: dict[date, float]) -> None:
+    if not path.exists():
+        return
+    with locked(path):
+        sketch = load_sketch(path)
+        if sketch is None:
+            return
+        sketch.replace(before, after)
+        save_sketch(path, sketch)
+
+
+def grading_sketch(args: argparse.Namespace) -> PercentileSketch | None:
+    if args.grading != "percentile":
+        return None
+    sketch = load_sketch(args.sketch)
+    if sketch is None or not sketch.total:
+        raise SystemExit(
+            f"백분위 스케치가 없습니다: {args.sketch} (rebuild-sketch를 먼저 실행하세요)"
+        )
+    return sketch
+
+
 def week_label(week_start: date) -> str:
     year, week, _ = week_start.isocalendar()
     return f"{week_start.strftime(DATE_FMT)} (ISO {year}-W{week:02d})"
 
 
+def parse_max_points(value: str) -> int:
+    try:
+        count = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("점 개수는 정수여야 합니다.") from exc
+    if count < 3:
+        raise argparse.ArgumentTypeError("점 개수는 3 이상이어야 합니다.")
+    return count
+
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> list[int]:
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    buckets = threshold - 2
+    selected = [0]
+    anchor = 0
+    for bucket in range(buckets):
+        start = bucket * (count - 2) // buckets + 1
+        end = (bucket + 1) * (count - 2) // buckets + 1
+        next_end = min((bucket + 2) * (count - 2) // buckets + 1, count)
+        span = next_end - end
+        mean_x = sum(xs[end:next_end]) / span
+        mean_y = sum(ys[end:next_end]) / span
+        ax, ay = xs[anchor], ys[anchor]
+        anchor = max(
+            range(start, end),
+            key=lambda i: abs((ax - mean_x) * (ys[i] - ay) - (ax - xs[i]) * (mean_y - ay)),
+        )
+        selected.append(anchor)
+    selected.append(count - 1)
+    return selected
+
+
+def downsample_scores(scores: dict[date, float], max_points: int) -> dict[date, float]:
+    if len(scores) <= max_points:
+        return scores
+    weeks = sorted(scores)
+    values = [scores[week] for week in weeks]
+    ordinals = [week.toordinal() for week in weeks]
+    return {weeks[i]: values[i] for i in lttb_indices(ordinals, values, max_points)}
+
+
 def prepare_plot_series(
-    entries: Iterable[RoutineEntry],
+    series: ScoreSeries,
     per_category: bool,
     total_only: bool,
-) -> tuple[dict[date, float], dict[str, dict[date, float]]]:
-    totals = summarize_by_week(entries)
-    if not totals:
+    max_points: int | None = None,
+) -> ScoreSeries:
+    if not series.totals:
         raise ValueError("시각화할 데이터가 없습니다.")
 
-    if not total_only:
-        category_data = summarize_by_category(entries)
-    else:
-        category_data = {}
-
     if per_category:
-        category_data = summarize_by_category(entries)
-        totals = {}
-
-    return totals, category_data
+        series = ScoreSeries(totals={}, categories=series.categories)
+    elif total_only:
+        series = ScoreSeries(totals=series.totals, categories={})
+    if max_points is None:
+        return series
+    return ScoreSeries(
+        totals=downsample_scores(series.totals, max_points),
+        categories={
+            category: downsample_scores(scores, max_points)
+            for category, scores in series.categories.items()
+        },
+    )
 
 
-def plot_scores_matplotlib(
-    totals: dict[date, float],
-    category_data: dict[str, dict[date, float]],
-    output_path: Path,
-) -> None:
-    import matplotlib.pyplot as plt
-
+def plot_marker(weeks: Sequence[date]) -> str:
+    return "o" if len(weeks) <= MARKER_MAX_POINTS else "None"
+
+
+class ChartRenderer:
+    """One matplotlib Figure reused for every chart drawn in this process.
+
+    Lines are kept per label and only their data, colour and marker change
+    between charts; the legend is rebuilt when the set of lines changes.  A
+    lock serialises charts from server threads.
+    """
+
+    def __init__(self) -> None:
+        from matplotlib.figure import Figure
+
+        self.figure = Figure()
+        self.axes = self.figure.add_subplot()
+        self.axes.set_title("루틴 점수 추이")
+        self.axes.set_xlabel("주 시작일")
+        self.axes.set_ylim(0, 100)
+        self.axes.grid(True, axis="y", linestyle="--", alpha=0.6)
+        self.lines: dict[str, Line2D] = {}
+        self.labels: list[str] = []
+        self.lock = threading.Lock()
+
+    def render(self, series: ScoreSeries, output_path: Path) -> None:
+        named = [("총합", series.totals)] if series.totals else []
+        named += sorted(series.categories.items())
+        with self.lock:
+            for index, (label, scores) in enumerate(named):
+                weeks = sorted(scores)
+                values = [scores[week] for week in weeks]
+                line = self.lines.get(label)
+                if line is None:
+                    (line,) = self.axes.plot(weeks, values)
+                    self.lines[label] = line
+                else:
+                    line.set_data(weeks, values)
+                line.set_color(f"C{index}")
+                line.set_zorder(2 + index / 100)
+                line.set_marker(plot_marker(weeks))
+            labels = [label for label, _ in named]
+            for label in [label for label in self.lines if label not in labels]:
+                self.lines.pop(label).remove()
+            if labels != self.labels:
+                legend = self.axes.get_legend()
+                if legend is not None:
+                    legend.remove()
+                if labels:
+                    self.axes.legend([self.lines[label] for label in labels], labels)
+                self.axes.set_ylabel("점수" if series.totals else "")
+                self.labels = labels
+            self.axes.relim()
+            self.axes.autoscale_view(scaley=False)
+            # Tick labels change with the date range, so the margins do too.
+            self.figure.tight_layout()
+            self.figure.savefig(output_path)
+
+
+@lru_cache(maxsize=None)
+def chart_renderer() -> ChartRenderer:
+    return ChartRenderer()
+
+
+def plot_scores_matplotlib(series: ScoreSeries, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    chart_renderer().render(series, output_path)
 
-    if totals:
-        weeks = sorted(totals.keys())
-        scores = [totals[week] for week in weeks]
-        plt.plot(weeks, scores, marker="o", label="총합")
-        plt.ylabel("점수")
 
-    for category, week_scores in sorted(category_data.items()):
-        weeks = sorted(week_scores.keys())
-        scores = [week_scores[week] for week in weeks]
-        plt.plot(weeks, scores, marker="o", label=category)
+def plot_chart(chart: tuple[ScoreSeries, Path]) -> tuple[Path, bool]:
+    series, output_path = chart
+    return generate_plot(series, output_path, per_category=False, total_only=False)
 
-    if totals or category_data:
-        plt.legend()
 
-    plt.title("루틴 점수 추이")
-    plt.xlabel("주 시작일")
-    plt.ylim(0, 100)
-    plt.grid(True, axis="y", linestyle="--", alpha=0.6)
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
+def plot_charts(
+    charts: list[tuple[ScoreSeries, Path]], jobs: int | None
+) -> list[tuple[Path, bool]]:
+    # Each worker process keeps its own ChartRenderer across the charts it draws.
+    return map_parallel(plot_chart, charts, jobs)
 
 
-def plot_scores_svg(
-    totals: dict[date, float],
-    category_data: dict[str, dict[date, float]],
-    output_path: Path,
-) -> Path:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=None)
+def svg_header() -> str:
+    width, height, padding = SVG_WIDTH, SVG_HEIGHT, SVG_PADDING
+    y_labels = "".join(
+        f'<text x="{padding - 10}" y="{svg_y(score):.1f}" font-size="10" '
+        f'text-anchor="end">{score}</text>'
+        for score in range(0, 101, 20)
+    )
+    return f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">
+  <rect width="100%" height="100%" fill="white" />
+  <text x="{width/2:.1f}" y="20" text-anchor="middle" font-size="14">루틴 점수 추이</text>
+  <line x1="{padding}" y1="{padding}" x2="{padding}" y2="{height - padding}" stroke="#ccc" />
+  <line x1="{padding}" y1="{height - padding}" x2="{width - padding}" y2="{height - padding}" stroke="#ccc" />
+  {y_labels}
+  """
 
-    all_dates = sorted({*totals.keys(), *{d for data in category_data.values() for d in data}})
-    if not all_dates:
-        raise ValueError("시각화할 데이터가 없습니다.")
 
-    width, height, padding = 800, 400, 50
-    x_step = (width - 2 * padding) / max(len(all_dates) - 1, 1)
+@lru_cache(maxsize=64)
+def svg_legend_item(index: int, label: str, color: str) -> str:
+    x = SVG_PADDING + index * 120
+    y = SVG_PADDING / 2
+    return (
+        f'<rect x="{x}" y="{y}" width="10" height="10" fill="{color}" />'
+        f'<text x="{x + 14}" y="{y + 9}" font-size="10">{label}</text>'
+    )
 
-    def x_pos(index: int) -> float:
-        return padding + index * x_step
 
-    def y_pos(score: float) -> float:
-        return height - padding - (score / 100) * (height - 2 * padding)
+def svg_y(score: float) -> float:
+    return SVG_HEIGHT - SVG_PADDING - (score / 100) * (SVG_HEIGHT - 2 * SVG_PADDING)
 
-    lines = []
-    labels = []
 
-    def add_series(label: str, series: dict[date, float], color: str) -> None:
-        points = []
-        for idx, day in enumerate(all_dates):
-            score = series.get(day)
-            if score is None:
-                continue
-            points.append((x_pos(idx), y_pos(score)))
-        if not points:
-            return
-        path = " ".join(
-            [f"M {points[0][0]:.1f} {points[0][1]:.1f}"]
-            + [f"L {x:.1f} {y:.1f}" for x, y in points[1:]]
-        )
-        lines.append(f'<path d="{path}" fill="none" stroke="{color}" stroke-width="2" />')
-        labels.append((label, color))
-
-    add_series("총합", totals, "#1f77b4")
-    palette = ["#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
-    for color, (category, series) in zip(palette, sorted(category_data.items())):
-        add_series(category, series, color)
-
-    x_labels = []
-    for idx, day in enumerate(all_dates):
-        x_labels.append(
-            f'<text x="{x_pos(idx):.1f}" y="{height - padding + 20}" '
+def write_scores_svg(series: ScoreSeries, handle: IO[str]) -> None:
+    totals, category_data = series.totals, series.categories
+    all_dates = sorted({*totals.keys(), *{d for data in category_data.values() for d in data}})
+    if not all_dates:
+        raise ValueError("시각화할 데이터가 없습니다.")
+
+    # x follows the calendar, so weeks dropped by LTTB or never recorded
+    # leave real gaps instead of squeezing the remaining points together.
+    first_day = all_dates[0].toordinal()
+    x_scale = (SVG_WIDTH - 2 * SVG_PADDING) / max(all_dates[-1].toordinal() - first_day, 1)
+    x_pos = {day: SVG_PADDING + (day.toordinal() - first_day) * x_scale for day in all_dates}
+    lines = [("총합", totals, SVG_TOTAL_COLOR)] + [
+        (category, scores, color)
+        for color, (category, scores) in zip(SVG_PALETTE, sorted(category_data.items()))
+        if scores
+    ]
+    if not totals:
+        lines.pop(0)
+
+    handle.write(svg_header())
+    label_gap = (SVG_WIDTH - 2 * SVG_PADDING) / SVG_MAX_X_LABELS
+    label_y = SVG_HEIGHT - SVG_PADDING + 20
+    last_label = -label_gap
+    for day in all_dates:
+        if x_pos[day] - last_label < label_gap:
+            continue
+        last_label = x_pos[day]
+        handle.write(
+            f'<text x="{x_pos[day]:.1f}" y="{label_y}" '
             f'font-size="10" text-anchor="middle">{day.strftime("%m-%d")}</text>'
         )
+    handle.write("\n  ")
+    for _, scores, color in lines:
+        weeks = iter(sorted(scores))
+        first = next(weeks)
+        handle.write(f'<path d="M {x_pos[first]:.1f} {svg_y(scores[first]):.1f}')
+        handle.writelines(f" L {x_pos[day]:.1f} {svg_y(scores[day]):.1f}" for day in weeks)
+        handle.write(f'" fill="none" stroke="{color}" stroke-width="2" />')
+    handle.write("\n  ")
+    handle.writelines(
+        svg_legend_item(idx, label, color) for idx, (label, _, color) in enumerate(lines)
+    )
+    handle.write("\n</svg>\n")
 
-    y_labels = []
-    for score in range(0, 101, 20):
-        y = y_pos(score)
-        y_labels.append(
-            f'<text x="{padding - 10}" y="{y:.1f}" font-size="10" '
-            f'text-anchor="end">{score}</text>'
-        )
 
-    legend_items = []
-    legend_y = padding / 2
-    legend_x = padding
-    for idx, (label, color) in enumerate(labels):
-        x = legend_x + idx * 120
-        legend_items.append(
-            f'<rect x="{x}" y="{legend_y}" width="10" height="10" fill="{color}" />'
-            f'<text x="{x + 14}" y="{legend_y + 9}" font-size="10">{label}</text>'
-        )
+def open_svg(path: Path) -> IO[str]:
+    if path.suffix == ".svgz":
+        # mtime=0 keeps identical charts byte-identical.
+        return io.TextIOWrapper(gzip.GzipFile(path, "wb", mtime=0), encoding="utf-8")
+    return path.open("w", encoding="utf-8")
 
-    svg = f"""<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">
-  <rect width="100%" height="100%" fill="white" />
-  <text x="{width/2:.1f}" y="20" text-anchor="middle" font-size="14">루틴 점수 추이</text>
-  <line x1="{padding}" y1="{padding}" x2="{padding}" y2="{height - padding}" stroke="#ccc" />
-  <line x1="{padding}" y1="{height - padding}" x2="{width - padding}" y2="{height - padding}" stroke="#ccc" />
-  {''.join(y_labels)}
-  {''.join(x_labels)}
-  {''.join(lines)}
-  {''.join(legend_items)}
-</svg>
-"""
-    output_path.write_text(svg, encoding="utf-8")
+
+def plot_scores_svg(series: ScoreSeries, output_path: Path) -> Path:
+    if not series.totals and not any(series.categories.values()):
+        raise ValueError("시각화할 데이터가 없습니다.")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open_svg(output_path) as handle:
+        write_scores_svg(series, handle)
     return output_path
 
 
 def generate_plot(
-    entries: Iterable[RoutineEntry],
+    series: ScoreSeries,
     output_path: Path,
     per_category: bool,
     total_only: bool,
+    max_points: int | None = None,
 ) -> tuple[Path, bool]:
-    totals, category_data = prepare_plot_series(entries, per_category, total_only)
-    try:
-        import matplotlib.pyplot as plt  # noqa: F401
-    except ModuleNotFoundError:
-        svg_path = output_path if output_path.suffix == ".svg" else output_path.with_suffix(".svg")
-        plot_scores_svg(totals, category_data, svg_path)
+    series = prepare_plot_series(series, per_category, total_only, max_points)
+    if not matplotlib_available():
+        svg_path = (
+            output_path
+            if output_path.suffix in SVG_SUFFIXES
+            else output_path.with_suffix(".svg")
+        )
+        digest = series_digest(series, "svg", svg_path.suffix)
+        if not render_is_current(svg_path, digest):
+            with rendering(svg_path, digest):
+                plot_scores_svg(series, svg_path)
         return svg_path, False
 
-    plot_scores_matplotlib(totals, category_data, output_path)
+    digest = series_digest(series, "matplotlib", output_path.suffix)
+    if not render_is_current(output_path, digest):
+        with rendering(output_path, digest):
+            plot_scores_matplotlib(series, output_path)
     return output_path, True
 
 
+def make_entry(week_start: str, category: str, days: str) -> RoutineEntry:
+    week = parse_week_start(week_start.strip())
+    category = category.strip()
+    if category not in CATEGORY_WEIGHTS:
+        raise argparse.ArgumentTypeError(f"알 수 없는 카테고리입니다: {category}")
+    day_count = parse_days(days.strip())
+    validate_days(category, day_count)
+    return RoutineEntry(
+        week_start=week,
+        category=category,
+        days=day_count,
+        score=calculate_score(category, day_count),
+    )
+
+
+def iter_import_entries(
+    handle: IO[str], fmt: str, rejected: list[tuple[int, str]]
+) -> Iterator[RoutineEntry]:
+    if fmt == "jsonl":
+        rows: Iterable[tuple[int, str | dict[str, object]]] = (
+            (line_no, line) for line_no, line in enumerate(handle, start=1) if line.strip()
+        )
+    else:
+        reader = csv.DictReader(handle)
+        rows = ((reader.line_num, row) for row in reader)
+
+    for line_no, row in rows:
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+            entry = make_entry(
+                str(row["week_start"]), str(row["category"]), str(row["days"])
+            )
+        except KeyError as exc:
+            rejected.append((line_no, f"필수 항목이 없습니다: {exc.args[0]}"))
+            continue
+        except (argparse.ArgumentTypeError, TypeError, ValueError) as exc:
+            rejected.append((line_no, str(exc)))
+            continue
+        yield entry
+
+
+def import_command(args: argparse.Namespace) -> None:
+    fmt = args.format
+    if fmt is None:
+        fmt = "jsonl" if args.source.endswith((".jsonl", ".ndjson")) else "csv"
+    if args.source != "-" and not Path(args.source).exists():
+        raise SystemExit(f"원본 파일이 없습니다: {args.source}")
+
+    rejected: list[tuple[int, str]] = []
+    durability = durability_from_args(args)
+    before = week_totals(args.data) if args.sketch.exists() else None
+    started = time.perf_counter()
+    if args.source == "-":
+        count = append_entries(
+            args.data, iter_import_entries(sys.stdin, fmt, rejected), durability
+        ).count
+    else:
+        # utf-8-sig drops the BOM spreadsheet exports put before the header.
+        with open(args.source, "r", newline="", encoding="utf-8-sig") as handle:
+            count = append_entries(
+                args.data, iter_import_entries(handle, fmt, rejected), durability
+            ).count
+    elapsed = time.perf_counter() - started
+    if before is not None:
+        update_sketch(args.sketch, before, week_totals(args.data))
+
+    for line_no, message in rejected[:IMPORT_REJECT_PREVIEW]:
+        print(f"거부: {line_no}행 {message}", file=sys.stderr)
+    if len(rejected) > IMPORT_REJECT_PREVIEW:
+        print(f"거부: 외 {len(rejected) - IMPORT_REJECT_PREVIEW}건", file=sys.stderr)
+
+    rate = count / elapsed if elapsed > 0 else float(count)
+    print(
+        f"가져오기 완료: {count}건 저장, {len(rejected)}건 거부 "
+        f"({elapsed:.2f}초, {rate:,.0f}건/초)"
+    )
+
+
+def resolve_data_paths(path: Path) -> list[Path] | None:
+    if path.is_dir():
+        paths = sorted(
+            child
+            for child in path.iterdir()
+            if child.is_file() and child.suffix.lower() in DATA_SUFFIXES
+        )
+    elif glob.has_magic(str(path)):
+        paths = sorted(Path(match) for match in glob.glob(str(path)) if Path(match).is_file())
+    else:
+        return None
+    # Users are named after the file stem, which also names their report and
+    # chart, so bob.csv and bob.rtb would be counted twice and overwrite each other.
+    seen: dict[str, Path] = {}
+    for child in paths:
+        other = seen.setdefault(user_name(child), child)
+        if other != child:
+            raise SystemExit(f"사용자 이름이 같은 데이터 파일이 있습니다: {other}, {child}")
+    return paths
+
+
+def user_name(path: Path) -> str:
+    return path.stem
+
+
+def map_parallel(func: Callable[[T], R], items: list[T], jobs: int | None) -> list[R]:
+    workers = min(jobs or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, items, chunksize=max(1, len(items) // (workers * 4))))
+
+
+def combine_user_totals(per_user: Iterable[dict[date, float]]) -> dict[date, float]:
+    sums: dict[date, float] = defaultdict(float)
+    counts: dict[date, int] = defaultdict(int)
+    for totals in per_user:
+        for week_start, score in totals.items():
+            sums[week_start] += score
+            counts[week_start] += 1
+    return {week_start: sums[week_start] / counts[week_start] for week_start in sums}
+
+
+def durability_from_args(args: argparse.Namespace) -> Durability:
+    return Durability(args.durability, args.fsync_every, args.fsync_interval_ms)
+
+
+def filter_from_args(args: argparse.Namespace) -> EntryFilter | None:
+    if args.start is None and args.end is None and not args.categories:
+        return None
+    categories = frozenset(args.categories) if args.categories else None
+    return EntryFilter(args.start, args.end, categories)
+
+
 def init_command(args: argparse.Namespace) -> None:
-    ensure_csv(args.data)
+    ensure_storage(args.data)
     print(f"초기화 완료: {args.data}")
 
 
+def format_added(
+    entry: RoutineEntry, total_score: float, sketch: PercentileSketch | None = None
+) -> list[str]:
+    grade = grade_for_score(total_score, sketch)
+    return [
+        f"추가 완료: {entry.week_start} {entry.category} {entry.days}일 {entry.score}점",
+        f"주간 합계: {week_label(entry.week_start)} {total_score:.1f}점 {grade}",
+    ]
+
+
+def format_entries(entries: Iterable[RoutineEntry]) -> list[str]:
+    lines = [
+        f"{entry.week_start.strftime(DATE_FMT)}\t{entry.category}\t"
+        f"{entry.days}일\t{entry.score}점"
+        for entry in sorted(entries, key=lambda item: (item.week_start, item.category))
+    ]
+    return lines or ["등록된 루틴 점수가 없습니다."]
+
+
+def format_totals(
+    totals: dict[date, float], sketch: PercentileSketch | None = None
+) -> list[str]:
+    if not totals:
+        return ["등록된 루틴 점수가 없습니다."]
+
+    weeks = sorted(totals.keys())
+    grades = grades_for_scores([totals[week_start] for week_start in weeks], sketch)
+    return [
+        f"{week_label(week_start)}\t{totals[week_start]:.1f}점\t{grade}"
+        for week_start, grade in zip(weeks, grades)
+    ]
+
+
 def add_command(args: argparse.Namespace) -> None:
     category = args.category
     days = args.days
@@ -337,34 +1883,29 @@ def add_command(args: argparse.Namespace) -> None:
     entry = RoutineEntry(
         week_start=args.week_start, category=category, days=days, score=score
     )
-    append_entry(args.data, entry)
-    print(f"추가 완료: {entry.week_start} {entry.category} {entry.days}일 {entry.score}점")
-
-    entries = load_entries(args.data)
-    totals = summarize_by_week(entries)
-    total_score = totals.get(entry.week_start, 0.0)
-    grade = grade_for_score(total_score)
-    print(f"주간 합계: {week_label(entry.week_start)} {total_score:.1f}점 {grade}")
+    # Fail on a missing sketch before anything is written; the grade below
+    # reloads it so that it includes this week.
+    grading_sketch(args)
+    previous = week_total(args.data, entry.week_start)
+    append_entry(args.data, entry, durability_from_args(args))
+    total_score = week_total(args.data, entry.week_start) or 0.0
+    before = {} if previous is None else {entry.week_start: previous}
+    update_sketch(args.sketch, before, {entry.week_start: total_score})
+    print("\n".join(format_added(entry, total_score, grading_sketch(args))))
 
 
 def list_command(args: argparse.Namespace) -> None:
-    entries = load_entries(args.data)
-    if not entries:
-        print("등록된 루틴 점수가 없습니다.")
-        return
-
-    entries.sort(key=lambda item: (item.week_start, item.category))
-    for entry in entries:
-        print(
-            f"{entry.week_start.strftime(DATE_FMT)}\t{entry.category}\t"
-            f"{entry.days}일\t{entry.score}점"
-        )
+    entries = iter_entries(args.data, filter_from_args(args))
+    print("\n".join(format_entries(current_entries(entries))))
 
 
 def plot_command(args: argparse.Namespace) -> None:
-    entries = load_entries(args.data)
     output_path, used_matplotlib = generate_plot(
-        entries, args.output, args.per_category, args.total_only
+        load_score_series(args.data, args.jobs, filter_from_args(args)),
+        args.output,
+        args.per_category,
+        args.total_only,
+        args.max_points,
     )
     if used_matplotlib:
         print(f"그래프 저장 완료: {output_path}")
@@ -373,36 +1914,233 @@ def plot_command(args: argparse.Namespace) -> None:
 
 
 def summary_command(args: argparse.Namespace) -> None:
-    entries = load_entries(args.data)
-    totals = summarize_by_week(entries)
-    if not totals:
+    sketch = grading_sketch(args)
+    entry_filter = filter_from_args(args)
+    paths = resolve_data_paths(args.data)
+    if paths is None:
+        totals = week_totals(args.data, args.jobs, entry_filter)
+        print("\n".join(format_totals(totals, sketch)))
+        return
+
+    per_user = map_parallel(partial(week_totals, entry_filter=entry_filter), paths, args.jobs)
+    for path, totals in zip(paths, per_user):
+        print(f"[{user_name(path)}]")
+        print("\n".join(format_totals(totals, sketch)))
+    active = [totals for totals in per_user if totals]
+    print(f"[전체] 사용자 {len(active)}명 주차별 평균")
+    print("\n".join(format_totals(combine_user_totals(active), sketch)))
+
+
+def rebuild_sketch_command(args: argparse.Namespace) -> None:
+    paths = resolve_data_paths(args.data)
+    if paths is None:
+        paths = [args.data]
+    sketch = PercentileSketch()
+    for totals in map_parallel(week_totals, paths, args.jobs):
+        for score in totals.values():
+            sketch.add(score)
+    save_sketch(args.sketch, sketch)
+    print(f"백분위 스케치 재생성 완료: {args.sketch} (사용자 {len(paths)}명, {sketch.total}주)")
+
+
+def rebuild_totals_command(args: argparse.Namespace) -> None:
+    if is_sqlite_path(args.data):
+        print("SQLite 데이터는 주간 합계를 직접 집계하므로 캐시가 필요 없습니다.")
+        return
+    scores = rebuild_week_scores(args.data)
+    print(f"주간 합계 캐시 재생성 완료: {totals_path(args.data)} ({len(scores)}주)")
+
+
+def rebuild_index_command(args: argparse.Namespace) -> None:
+    if is_sqlite_path(args.data) or is_rtb_path(args.data):
+        print("주차 색인은 CSV 데이터에만 사용합니다.")
+        return
+    if not args.data.exists():
         print("등록된 루틴 점수가 없습니다.")
         return
+    with locked(args.data):
+        repair_csv_tail(args.data)
+        stamp = data_stamp(args.data)
+        with args.data.open("rb") as handle:
+            if handle.readline() != CSV_HEADER:
+                raise SystemExit(f"표준 헤더가 아닌 CSV는 색인할 수 없습니다: {args.data}")
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                blocks = index_blocks(mapped, len(CSV_HEADER), stamp[0])
+        write_week_index(args.data, blocks, stamp)
+    print(f"주차 색인 재생성 완료: {index_path(args.data)} ({len(blocks)}블록)")
+
+
+def compact_file(path: Path) -> int:
+    entries = sorted(
+        current_entries(iter_entries(path)),
+        key=lambda item: (item.week_start, item.category),
+    )
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        os.chmod(tmp_name, stat.S_IMODE(path.stat().st_mode))
+        if is_rtb_path(path):
+            with os.fdopen(fd, "wb") as binary:
+                binary.write(RTB_MAGIC)
+                binary.writelines(map(pack_rtb, entries))
+                sync_file(binary)
+        else:
+            with os.fdopen(fd, "w", newline="", encoding="utf-8") as handle:
+                handle.write(CSV_HEADER.decode())
+                csv.writer(handle).writerows(map(entry_row, entries))
+                sync_file(handle)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    rebuild_week_scores(path)
+    return len(entries)
+
+
+def compact_command(args: argparse.Namespace) -> None:
+    if not args.data.exists():
+        print("등록된 루틴 점수가 없습니다.")
+        return
+    before = args.data.stat().st_size
+    if is_sqlite_path(args.data):
+        with closing(connect_db(args.data)) as connection:
+            connection.execute("VACUUM")
+            (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+    else:
+        with locked(args.data):
+            if is_rtb_path(args.data):
+                repair_rtb_tail(args.data)
+            else:
+                repair_csv_tail(args.data)
+            count = compact_file(args.data)
+    after = args.data.stat().st_size
+    print(f"정리 완료: {args.data} {count}건 ({before:,} -> {after:,} bytes)")
 
-    for week_start in sorted(totals.keys()):
-        total_score = totals[week_start]
-        grade = grade_for_score(total_score)
-        print(f"{week_label(week_start)}\t{total_score:.1f}점\t{grade}")
+
+def migrate_command(args: argparse.Namespace) -> None:
+    if not args.source.exists():
+        raise SystemExit(f"원본 파일이 없습니다: {args.source}")
+    if args.destination.exists():
+        raise SystemExit(f"대상 파일이 이미 존재합니다: {args.destination}")
+
+    count = append_entries(
+        args.destination, iter_entries(args.source), durability_from_args(args)
+    ).count
+    print(f"변환 완료: {args.source} -> {args.destination} ({count}건)")
 
 
 def report_command(args: argparse.Namespace) -> None:
-    entries = load_entries(args.data)
-    totals = summarize_by_week(entries)
-    if not totals:
+    entry_filter = filter_from_args(args)
+    sketch = grading_sketch(args)
+    paths = resolve_data_paths(args.data)
+    if paths is not None:
+        multi_user_report(
+            paths, args.output, args.plot, args.jobs, entry_filter, args.max_points, sketch
+        )
+        return
+
+    series = load_score_series(args.data, args.jobs, entry_filter)
+    if not series.totals:
+        print("등록된 루틴 점수가 없습니다.")
+        return
+
+    report_path, _, _ = write_report(
+        series, args.output, args.plot, max_points=args.max_points, sketch=sketch
+    )
+    print(f"리포트 저장 완료: {report_path}")
+
+
+def user_report(
+    job: tuple[Path, Path, Path, EntryFilter | None, int | None, PercentileSketch | None],
+) -> tuple[Path | None, dict[date, float]]:
+    data_path, report_path, plot_path, entry_filter, max_points, sketch = job
+    series = load_score_series(data_path, 1, entry_filter)
+    if not series.totals:
+        return None, {}
+    report_path, _, _ = write_report(
+        series, report_path, plot_path, max_points=max_points, sketch=sketch
+    )
+    return report_path, series.totals
+
+
+def multi_user_report(
+    paths: list[Path],
+    report_path: Path,
+    plot_path: Path,
+    jobs: int | None,
+    entry_filter: EntryFilter | None = None,
+    max_points: int | None = None,
+    sketch: PercentileSketch | None = None,
+) -> None:
+    user_dir = report_path.with_suffix("")
+    plot_dir = plot_path.with_suffix("")
+    work = [
+        (
+            path,
+            user_dir / f"{user_name(path)}.html",
+            plot_dir / f"{user_name(path)}{plot_path.suffix}",
+            entry_filter,
+            max_points,
+            sketch,
+        )
+        for path in paths
+    ]
+    results = map_parallel(user_report, work, jobs)
+
+    user_reports: list[tuple[str, Path]] = []
+    per_user: list[dict[date, float]] = []
+    for path, (user_path, totals) in zip(paths, results):
+        if user_path is None:
+            continue
+        user_reports.append((user_name(path), user_path))
+        per_user.append(totals)
+    if not per_user:
         print("등록된 루틴 점수가 없습니다.")
         return
 
+    combined = ScoreSeries(totals=combine_user_totals(per_user), categories={})
+    report_path, _, _ = write_report(
+        combined, report_path, plot_path, user_reports, max_points, sketch
+    )
+    print(f"리포트 저장 완료: {report_path} (사용자 {len(user_reports)}명, {user_dir}/)")
+
+
+def write_report(
+    series: ScoreSeries,
+    report_path: Path,
+    plot_path: Path,
+    user_reports: list[tuple[str, Path]] | None = None,
+    max_points: int | None = None,
+    sketch: PercentileSketch | None = None,
+) -> tuple[Path, Path, bool]:
+    totals = series.totals
     plot_path, used_matplotlib = generate_plot(
-        entries, args.plot, per_category=False, total_only=False
+        series, plot_path, per_category=False, total_only=False, max_points=max_points
+    )
+
+    relative_plot_path = Path(os.path.relpath(plot_path, report_path.parent))
+    relative_users = [
+        (user, Path(os.path.relpath(path, report_path.parent)).as_posix())
+        for user, path in user_reports or []
+    ]
+    digest = render_digest(
+        "report",
+        sorted(totals.items()),
+        relative_users,
+        relative_plot_path.as_posix(),
+        used_matplotlib,
+        "fixed" if sketch is None else "percentile",
+        None if sketch is None else sketch.to_json(),
     )
+    if render_is_current(report_path, digest):
+        return report_path, plot_path, used_matplotlib
 
-    report_path = args.output
     report_path.parent.mkdir(parents=True, exist_ok=True)
 
+    weeks = sorted(totals)
+    grades = grades_for_scores([totals[week_start] for week_start in weeks], sketch)
     rows = []
-    for week_start in sorted(totals.keys()):
+    for week_start, grade in zip(weeks, grades):
         total_score = totals[week_start]
-        grade = grade_for_score(total_score)
         rows.append(
             f"<tr><td>{week_label(week_start)}</td><td>{total_score:.1f}점</td>"
             f"<td>{grade}</td></tr>"
@@ -411,7 +2149,29 @@ def report_command(args: argparse.Namespace) -> None:
     plot_note = (
         "" if used_matplotlib else "<p>matplotlib 미설치로 SVG 그래프를 사용했습니다.</p>"
     )
-    relative_plot_path = Path(os.path.relpath(plot_path, report_path.parent))
+    user_tab = user_section = ""
+    if relative_users:
+        user_rows = "".join(
+            f'<tr><td><a href="{path}">{html_escape(user)}</a></td></tr>'
+            for user, path in relative_users
+        )
+        user_tab = (
+            '\n    <button class="tab-button" data-tab="users" '
+            "onclick=\"showTab('users')\">사용자별</button>"
+        )
+        user_section = f"""
+  <div id="users" class="tab-content">
+    <h2>사용자별 리포트</h2>
+    <p>총합/등급 탭은 사용자 {len(relative_users)}명의 주차별 평균입니다.</p>
+    <table>
+      <thead>
+        <tr><th>사용자</th></tr>
+      </thead>
+      <tbody>
+        {user_rows}
+      </tbody>
+    </table>
+  </div>"""
     html = f"""<!doctype html>
 <html lang="ko">
 <head>
@@ -441,7 +2201,7 @@ def report_command(args: argparse.Namespace) -> None:
   <h1>루틴 주간 리포트</h1>
   <div class="tabs">
     <button class="tab-button" data-tab="summary" onclick="showTab('summary')">총합/등급</button>
-    <button class="tab-button" data-tab="trend" onclick="showTab('trend')">그래프 추이</button>
+    <button class="tab-button" data-tab="trend" onclick="showTab('trend')">그래프 추이</button>{user_tab}
   </div>
   <div id="summary" class="tab-content">
     <h2>주간 총합 및 등급</h2>
@@ -458,12 +2218,66 @@ def report_command(args: argparse.Namespace) -> None:
     <h2>그래프 추이</h2>
     {plot_note}
     <img src="{relative_plot_path.as_posix()}" alt="루틴 점수 추이 그래프" style="max-width: 100%;" />
-  </div>
+  </div>{user_section}
 </body>
 </html>
 """
-    report_path.write_text(html, encoding="utf-8")
-    print(f"리포트 저장 완료: {report_path}")
+    with rendering(report_path, digest):
+        report_path.write_text(html, encoding="utf-8")
+    return report_path, plot_path, used_matplotlib
+
+
+def serve_command(args: argparse.Namespace) -> None:
+    load_server_module().serve(
+        args.data, args.socket or DEFAULT_SOCKET_PATH, durability_from_args(args), args.sketch
+    )
+
+
+def serve_http_command(args: argparse.Namespace) -> None:
+    load_server_module().serve_http(
+        args.data,
+        args.host,
+        args.port,
+        args.report_output,
+        args.report_plot,
+        durability_from_args(args),
+        args.sketch,
+    )
+
+
+def load_server_module() -> ModuleType:
+    # Server code lives in its own module so that plain CLI calls do not pay
+    # for importing socket/asyncio; register this module under its import
+    # name first so the server shares it when run as a script.
+    sys.modules.setdefault("routine_tracker", sys.modules[__name__])
+    import routine_server
+
+    return routine_server
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--from", dest="start", type=parse_date, help="이 주 시작일부터 포함 (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--to", dest="end", type=parse_date, help="이 주 시작일까지 포함 (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--category",
+        dest="categories",
+        action="append",
+        choices=sorted(CATEGORY_WEIGHTS.keys()),
+        help="이 카테고리만 포함 (여러 번 지정 가능)",
+    )
+
+
+def add_max_points_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-points",
+        type=parse_max_points,
+        default=None,
+        help="라인마다 그릴 최대 점 개수, 넘으면 LTTB로 모양을 유지하며 줄임 (기본값: 전부)",
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -474,7 +2288,58 @@ def build_parser() -> argparse.ArgumentParser:
         "--data",
         type=Path,
         default=DEFAULT_DATA_PATH,
-        help="CSV 데이터 파일 경로 (기본값: data/routines.csv)",
+        help=(
+            "데이터 파일 경로, .db/.sqlite는 SQLite, .rtb는 바이너리 형식 사용. "
+            "summary/report는 디렉터리나 글롭(예: 'users/*.csv')을 받아 사용자별로 처리 (기본값: data/routines.csv)"
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help=(
+            "여러 사용자나 큰 CSV(32MiB 이상)의 조각을 처리할 프로세스 수 "
+            "(기본값: CPU 코어 수)"
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="실행 중인 serve 서버의 소켓 경로 (add/list/summary를 서버에 위임)",
+    )
+    parser.add_argument(
+        "--grading",
+        choices=["fixed", "percentile"],
+        default="fixed",
+        help="등급 기준: fixed는 고정 점수 기준, percentile은 전체 주간 합계의 실제 백분위",
+    )
+    parser.add_argument(
+        "--sketch",
+        type=Path,
+        default=DEFAULT_SKETCH_PATH,
+        help="백분위 스케치 파일 경로 (기본값: data/population.sketch)",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default=DEFAULT_DURABILITY.mode,
+        help=(
+            "쓰기 내구성: none은 OS에 맡김, batch는 N행/T밀리초마다와 명령 끝에 fsync, "
+            "always는 행마다 fsync (기본값: batch)"
+        ),
+    )
+    parser.add_argument(
+        "--fsync-every",
+        type=int,
+        default=DEFAULT_FSYNC_EVERY,
+        help=f"batch 모드에서 fsync할 행 간격 (기본값: {DEFAULT_FSYNC_EVERY})",
+    )
+    parser.add_argument(
+        "--fsync-interval-ms",
+        type=float,
+        default=DEFAULT_FSYNC_INTERVAL_MS,
+        help=f"batch 모드에서 fsync할 시간 간격(ms) (기본값: {DEFAULT_FSYNC_INTERVAL_MS:g})",
     )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -494,7 +2359,22 @@ def build_parser() -> argparse.ArgumentParser:
     )
     add_parser.set_defaults(func=add_command)
 
+    import_parser = subparsers.add_parser(
+        "import", help="CSV/JSONL 파일에서 여러 점수를 한 번에 가져옵니다."
+    )
+    import_parser.add_argument(
+        "source", help="가져올 파일 경로 (- 는 표준 입력)"
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        default=None,
+        help="입력 형식 (기본값: 확장자로 판단, 표준 입력은 csv)",
+    )
+    import_parser.set_defaults(func=import_command)
+
     list_parser = subparsers.add_parser("list", help="등록된 점수를 표시합니다.")
+    add_filter_arguments(list_parser)
     list_parser.set_defaults(func=list_command)
 
     plot_parser = subparsers.add_parser("plot", help="그래프를 생성합니다.")
@@ -515,11 +2395,67 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="총합 라인만 표시합니다.",
     )
+    add_max_points_argument(plot_parser)
+    add_filter_arguments(plot_parser)
     plot_parser.set_defaults(func=plot_command)
 
     summary_parser = subparsers.add_parser("summary", help="주간 총점과 등급을 표시합니다.")
+    add_filter_arguments(summary_parser)
     summary_parser.set_defaults(func=summary_command)
 
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-totals", help="주간 합계 캐시 파일을 다시 만듭니다."
+    )
+    rebuild_parser.set_defaults(func=rebuild_totals_command)
+
+    rebuild_index_parser = subparsers.add_parser(
+        "rebuild-index", help="기간 조회용 주차 색인 파일을 다시 만듭니다."
+    )
+    rebuild_index_parser.set_defaults(func=rebuild_index_command)
+
+    compact_parser = subparsers.add_parser(
+        "compact", help="중복 기록을 정리하고 주차/카테고리 순으로 다시 씁니다."
+    )
+    compact_parser.set_defaults(func=compact_command)
+
+    sketch_parser = subparsers.add_parser(
+        "rebuild-sketch", help="전체 주간 합계로 백분위 스케치를 다시 만듭니다."
+    )
+    sketch_parser.set_defaults(func=rebuild_sketch_command)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate", help="데이터를 다른 저장 형식(CSV/SQLite/RTB)으로 옮깁니다."
+    )
+    migrate_parser.add_argument("source", type=Path, help="원본 데이터 파일 경로")
+    migrate_parser.add_argument(
+        "destination", type=Path, help="새 데이터 파일 경로 (.csv, .db 또는 .rtb)"
+    )
+    migrate_parser.set_defaults(func=migrate_command)
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="데이터를 메모리에 올려 두고 Unix 소켓으로 요청을 처리합니다."
+    )
+    serve_parser.set_defaults(func=serve_command)
+
+    http_parser = subparsers.add_parser(
+        "serve-http", help="add/summary/list/report를 로컬 HTTP JSON API로 제공합니다."
+    )
+    http_parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본값: 127.0.0.1)")
+    http_parser.add_argument("--port", type=int, default=8765, help="포트 (기본값: 8765)")
+    http_parser.add_argument(
+        "--report-output",
+        type=Path,
+        default=DEFAULT_REPORT_PATH,
+        help="POST /report가 저장할 HTML 경로",
+    )
+    http_parser.add_argument(
+        "--report-plot",
+        type=Path,
+        default=DEFAULT_PLOT_PATH,
+        help="POST /report가 저장할 그래프 경로",
+    )
+    http_parser.set_defaults(func=serve_http_command)
+
     report_parser = subparsers.add_parser("report", help="탭 포함 리포트를 생성합니다.")
     report_parser.add_argument(
         "--output",
@@ -533,6 +2469,8 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_PLOT_PATH,
         help="리포트에 포함할 그래프 이미지 경로",
     )
+    add_max_points_argument(report_parser)
+    add_filter_arguments(report_parser)
     report_parser.set_defaults(func=report_command)
 
     return parser
@@ -541,6 +2479,19 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
+    # The server always grades with the fixed thresholds, so percentile
+    # grading is answered locally from the sketch file.
+    if (
+        args.socket is not None
+        and args.command in CLIENT_COMMANDS
+        and args.grading != "percentile"
+    ):
+        response = load_server_module().client_request(args)
+        if response is not None:
+            if not response["ok"]:
+                raise SystemExit(response["error"])
+            print("\n".join(response["lines"]))
+            return
     args.func(args)
 
 